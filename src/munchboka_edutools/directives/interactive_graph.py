@@ -29,6 +29,7 @@ License: MIT
 """
 
 import hashlib
+import multiprocessing
 import os
 import re
 import shutil
@@ -707,8 +708,6 @@ class InteractiveGraphDirective(SphinxDirective):
                 frame_tasks.append((frame_content, render_options))
 
             try:
-                import multiprocessing
-
                 mp_context = multiprocessing.get_context("spawn")
                 with ProcessPoolExecutor(
                     max_workers=worker_count,
@@ -750,7 +749,11 @@ class InteractiveGraphDirective(SphinxDirective):
         # Compute deltas
         try:
             logger.info(f"{desc}: computing SVG deltas")
-            base_svg, deltas = compute_svg_deltas(svg_frames)
+            base_svg, deltas = compute_svg_deltas(
+                svg_frames,
+                workers=worker_count,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
 
             # Save in delta format
             save_delta_format(base_svg, deltas, output_dir)
@@ -1002,8 +1005,6 @@ class InteractiveGraphDirective(SphinxDirective):
                 frame_tasks.append((frame_content, render_options))
 
             try:
-                import multiprocessing
-
                 mp_context = multiprocessing.get_context("spawn")
                 with ProcessPoolExecutor(
                     max_workers=worker_count,
@@ -1050,7 +1051,11 @@ class InteractiveGraphDirective(SphinxDirective):
 
         # Compute deltas and write delta assets
         logger.info(f"{desc}: computing SVG deltas")
-        base_svg, deltas = compute_svg_deltas(svg_frames)
+        base_svg, deltas = compute_svg_deltas(
+            svg_frames,
+            workers=worker_count,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
         save_delta_format(base_svg, deltas, output_dir)
 
         meta = {
@@ -1123,7 +1128,7 @@ class InteractiveGraphDirective(SphinxDirective):
                 f"</div>"
             )
 
-        from .svg_delta import generate_multi_delta_html
+        from .svg_delta import generate_multi_delta_html, read_inline_base_svg
 
         base_svg_url = f"{rel_prefix}_static/interactive/{base_name}/base.svg"
         deltas_json_url = f"{rel_prefix}_static/interactive/{base_name}/deltas.json"
@@ -1136,6 +1141,7 @@ class InteractiveGraphDirective(SphinxDirective):
             unique_id,
             wrapper_style=wrapper_style,
             height=height,
+            base_svg=read_inline_base_svg(delta_base_path),
         )
 
     def _ensure_element_ids(self, svg_content: str, frame_idx: int) -> str:
@@ -1234,7 +1240,7 @@ class InteractiveGraphDirective(SphinxDirective):
 
         if use_delta_format:
             # Use delta-based HTML
-            from .svg_delta import generate_delta_html
+            from .svg_delta import generate_delta_html, read_inline_base_svg
 
             base_svg_url = f"{rel_prefix}_static/interactive/{base_name}/base.svg"
             deltas_json_url = f"{rel_prefix}_static/interactive/{base_name}/deltas.json"
@@ -1249,6 +1255,7 @@ class InteractiveGraphDirective(SphinxDirective):
                 initial_idx,
                 wrapper_style,
                 height,
+                base_svg=read_inline_base_svg(delta_base_path),
             )
         else:
             # Fallback: frame-based HTML (old method)
@@ -34,18 +34,28 @@ Date: January 2026
 
 from __future__ import annotations
 
+import ast
+import functools
 import hashlib
+import io
 import os
 import re
 import shutil
-import uuid
 import platform
 import warnings
+from dataclasses import dataclass, replace
+from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
 import numpy as np
-import matplotlib.pyplot as plt
+import matplotlib
+
+matplotlib.use("Agg")
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import sympy as sp
+from scipy.optimize import brentq
+from sympy.calculus.util import continuous_domain
 
 from docutils import nodes
 from docutils.parsers.rst import directives
@@ -64,11 +74,29 @@ else:
 
 if latex_available:
     try:
-        plt.rc("text", usetex=True)
+        matplotlib.rc("text", usetex=True)
     except (FileNotFoundError, RuntimeError):
-        plt.rc("text", usetex=False)
+        matplotlib.rc("text", usetex=False)
 else:
-    plt.rc("text", usetex=False)
+    matplotlib.rc("text", usetex=False)
+
+
+def _warm_up_text_rendering() -> None:
+    """Prime Matplotlib's font and mathtext caches once at import.
+
+    Otherwise the first chart of a build pays for font lookup and (when
+    usetex is on) the first LaTeX run.
+    """
+    try:
+        fig = Figure()
+        ax = fig.add_subplot()
+        ax.text(0, 0, r"$x_1$")
+        fig.draw_without_rendering()
+    except Exception:
+        pass
+
+
+_warm_up_text_rendering()
 
 
 # ------------------------------------
@@ -76,6 +104,61 @@ else:
 # ------------------------------------
 
 
+@functools.lru_cache(maxsize=4096)
+def _latex(expr) -> str:
+    """LaTeX for a SymPy expression (with ln notation), memoized.
+
+    The same simple roots and factors (0, ±1, integers, pi/2, x - 2, ...) recur
+    across a whole docs build.
+    """
+    return sp.latex(expr, ln_notation=True)
+
+
+@dataclass(frozen=True)
+class Factor:
+    """One factor row of a sign chart: ``expression**exponent`` and its real roots.
+
+    ``kind`` is ``"polynomial"`` for factors from :func:`get_factors` and
+    ``"transcendental"`` otherwise. Root-less polynomial factors (the leading
+    coefficient, irreducible quadratics) are listed first; root-less
+    transcendental factors last.
+    """
+
+    expression: Any
+    exponent: int = 1
+    roots: Tuple[Any, ...] = ()
+    kind: str = "polynomial"
+    expression_latex: str | None = None
+    is_denominator: bool = False
+
+
+def _sample_on_grid(f_lamb, xs: np.ndarray) -> np.ndarray:
+    """Evaluate a lambdified function on a grid in one vectorized call.
+
+    Points where the function is undefined, non-real or raises come back as NaN.
+    Falls back to point-by-point evaluation when the lambdified function does
+    not broadcast over arrays.
+    """
+    try:
+        ys = np.asarray(f_lamb(xs))
+        if ys.shape != xs.shape:
+            # Expressions without x lambdify to scalars
+            ys = np.broadcast_to(ys, xs.shape)
+        if np.iscomplexobj(ys):
+            ys = np.where(ys.imag == 0, ys.real, np.nan)
+        return ys.astype(np.float64)
+    except Exception:
+        pass
+
+    def _one(xp):
+        try:
+            return float(f_lamb(xp))
+        except Exception:
+            return np.nan
+
+    return np.array([_one(xp) for xp in xs], dtype=np.float64)
+
+
 def get_zeros_and_singularities(f, x, domain=None):
     """Find zeros and singularities (poles/discontinuities) of arbitrary functions.
 
@@ -133,28 +216,22 @@ def get_zeros_and_singularities(f, x, domain=None):
             # Suppress warnings for evaluation at singularities
             with warnings.catch_warnings():
                 warnings.simplefilter("ignore")
-                y_vals = []
-                valid_x = []
-                for xp in test_points:
+                y_all = _sample_on_grid(f_lamb, test_points)
+
+                # Exclude points near singularities, non-finite and huge values
+                valid = np.isfinite(y_all) & (np.abs(y_all) < 1e10)
+                sing_vals = []
+                for sing in singularities:
                     try:
-                        yp = float(f_lamb(xp))
-                        # Exclude points near singularities
-                        near_sing = False
-                        for sing in singularities:
-                            try:
-                                if abs(xp - float(sing.evalf())) < 1e-4:
-                                    near_sing = True
-                                    break
-                            except:
-                                pass
-                        if not near_sing and np.isfinite(yp) and abs(yp) < 1e10:
-                            y_vals.append(yp)
-                            valid_x.append(xp)
-                    except:
+                        sing_vals.append(float(sing.evalf()))
+                    except Exception:
                         pass
+                if sing_vals:
+                    dist = np.abs(test_points[:, None] - np.asarray(sing_vals)[None, :])
+                    valid &= ~np.any(dist < 1e-4, axis=1)
 
-                y_vals = np.array(y_vals)
-                valid_x = np.array(valid_x)
+                y_vals = y_all[valid]
+                valid_x = test_points[valid]
 
                 # Find sign changes (potential zeros) and near-zero values
                 numerical_zeros = []
@@ -169,8 +246,6 @@ def get_zeros_and_singularities(f, x, domain=None):
                             continue
                         # Refine zero location
                         try:
-                            from scipy.optimize import brentq
-
                             x_zero = brentq(f_lamb, valid_x[idx], valid_x[idx + 1], xtol=1e-10)
                             numerical_zeros.append(sp.Float(x_zero))
                         except:
@@ -243,7 +318,7 @@ def get_factors(polynomial, x):
 
     # We'll add the overall coefficient as its own factor after we've normalized the remaining
     # factors (so the displayed coefficient is the true leading coefficient in x).
-    linear_factors: List[Dict[str, Any]] = []
+    linear_factors: List[Factor] = []
 
     for linear_factor, exponent in factor_list[1]:
         exponent = int(exponent)
@@ -263,13 +338,7 @@ def get_factors(polynomial, x):
 
         # Handle factors that may have multiple real roots (e.g., quadratics like x^2 - 2)
         if not roots:
-            linear_factors.append(
-                {
-                    "expression": linear_factor,
-                    "exponent": exponent,
-                    "root": -np.inf,
-                }
-            )
+            linear_factors.append(Factor(expression=linear_factor, exponent=exponent))
         else:
             # For each root of the factor, create a separate entry with the correct exponent
             for root_value in roots:
@@ -281,23 +350,23 @@ def get_factors(polynomial, x):
                     # SymPy's default latex() often reorders addition as `c + x`, which is
                     # visually unusual in this context; we want `x + c` / `x - c`.
                     if root_value == 0:
-                        expression_latex = sp.latex(x, ln_notation=True)
+                        expression_latex = _latex(x)
                     elif getattr(root_value, "could_extract_minus_sign", lambda: False)():
-                        expression_latex = f"{sp.latex(x, ln_notation=True)} + {sp.latex(-root_value, ln_notation=True)}"
+                        expression_latex = f"{_latex(x)} + {_latex(-root_value)}"
                     else:
-                        expression_latex = f"{sp.latex(x, ln_notation=True)} - {sp.latex(root_value, ln_notation=True)}"
+                        expression_latex = f"{_latex(x)} - {_latex(root_value)}"
 
                     linear_factors.append(
-                        {
-                            "expression": x - root_value,
-                            "expression_latex": expression_latex,
-                            "exponent": exponent,  # Use the actual exponent from factorization
-                            "root": root_value,
-                        }
+                        Factor(
+                            expression=x - root_value,
+                            expression_latex=expression_latex,
+                            exponent=exponent,  # Use the actual exponent from factorization
+                            roots=(root_value,),
+                        )
                     )
 
     if leading_coeff != 1:
-        linear_factors.insert(0, {"expression": leading_coeff, "exponent": 1, "root": -np.inf})
+        linear_factors.insert(0, Factor(expression=leading_coeff))
 
     return linear_factors
 
@@ -312,7 +381,7 @@ def get_transcendental_factors(f, x, zeros, singularities):
         singularities: list of singularities (poles)
 
     Returns:
-        list of factor dictionaries (one per unique expression+exponent, with all roots)
+        list of Factor entries (one per unique expression+exponent, with all roots)
     """
     factors = []
 
@@ -347,7 +416,7 @@ def _extract_factors_from_expression(expr, x, zeros, singularities):
         singularities: singularities to associate with this expression
 
     Returns:
-        list of factor dictionaries
+        list of Factor entries
     """
     factors = []
 
@@ -381,11 +450,12 @@ def _extract_factors_from_expression(expr, x, zeros, singularities):
             # Create single factor with all zeros
             if base_zeros:
                 factors.append(
-                    {
-                        "expression": base,
-                        "exponent": exponent,
-                        "roots": base_zeros,  # Changed: store all roots together
-                    }
+                    Factor(
+                        expression=base,
+                        exponent=exponent,
+                        roots=tuple(base_zeros),
+                        kind="transcendental",
+                    )
                 )
 
         # If it's a product, try to extract individual factors
@@ -455,50 +525,35 @@ def _extract_factors_from_expression(expr, x, zeros, singularities):
                 all_roots = factor_info["zeros"] + factor_info["singularities"]
                 # Always add the factor, even if it has no roots
                 factors.append(
-                    {
-                        "expression": factor_info["expression"],
-                        "exponent": factor_info["exponent"],
-                        "roots": all_roots if all_roots else [],
-                    }
+                    Factor(
+                        expression=factor_info["expression"],
+                        exponent=factor_info["exponent"],
+                        roots=tuple(all_roots),
+                        kind="transcendental",
+                    )
                 )
         else:
             # Not a product or power, show as single factor
             all_roots = zeros + singularities
             factors.append(
-                {
-                    "expression": factored,
-                    "exponent": 1,
-                    "roots": all_roots if all_roots else [],
-                }
+                Factor(expression=factored, roots=tuple(all_roots), kind="transcendental")
             )
     except:
         # Fallback: just use the original expression
         all_roots = zeros + singularities
-        factors.append(
-            {
-                "expression": expr,
-                "exponent": 1,
-                "roots": all_roots if all_roots else [],
-            }
-        )
+        factors.append(Factor(expression=expr, roots=tuple(all_roots), kind="transcendental"))
 
     return factors
 
 
 def sort_factors(factors):
-    def get_numeric_root(factor, subs: Dict[sp.Symbol, float] | None = None):
-        # Handle both old format ("root") and new format ("roots")
-        if "roots" in factor and factor["roots"]:
-            # For new format, use the first root for sorting
-            root = factor["roots"][0]
-        elif "root" in factor:
-            root = factor.get("root")
-        else:
-            # No roots - sort to end
-            return np.inf
+    def get_numeric_root(factor: Factor, subs: Dict[sp.Symbol, float] | None = None):
+        if not factor.roots:
+            # Constant/irreducible polynomial factors first, root-less transcendental ones last
+            return -np.inf if factor.kind == "polynomial" else np.inf
 
-        if root == -np.inf or root is None:
-            return -np.inf
+        # Use the first root for sorting
+        root = factor.roots[0]
         try:
             # Try to convert symbolic roots to float for comparison
             if subs:
@@ -614,6 +669,10 @@ def _choose_param_subs(
 
 def _numeric(expr: Any, subs: Dict[sp.Symbol, float] | None = None) -> float:
     """Best-effort numeric evaluation for sorting and sampling."""
+    # Integer and rational roots (the common polynomial case) convert exactly
+    # without going through the arbitrary-precision evalf machinery.
+    if getattr(expr, "is_Rational", False):
+        return float(expr)
     e = sp.sympify(expr)
     if subs:
         e = e.subs(subs)
@@ -671,8 +730,6 @@ def _domain_breakpoints_real(f: sp.Expr, x: sp.Symbol) -> tuple[list[Any], sp.Se
     is (not) defined over the reals.
     """
     try:
-        from sympy.calculus.util import continuous_domain
-
         dom = continuous_domain(f, x, sp.S.Reals)
     except Exception:
         return [], None
@@ -708,12 +765,11 @@ def _domain_breakpoints_real(f: sp.Expr, x: sp.Symbol) -> tuple[list[Any], sp.Se
 
     walk(dom)
 
-    # Deduplicate while preserving order (symbolic equality)
-    out: list[Any] = []
+    # Deduplicate while preserving order (canonical form)
+    out: Dict[str, Any] = {}
     for b in breaks:
-        if b not in out:
-            out.append(b)
-    return out, dom
+        out.setdefault(sp.srepr(b), b)
+    return list(out.values()), dom
 
 
 def draw_factors(
@@ -742,34 +798,31 @@ def draw_factors(
     x_max = 1.05
 
     # All roots sorted, used for splitting every factor's sign line
-    all_sorted_roots = sorted(
-        roots,
-        key=lambda r: root_numeric.get(r, _numeric(r, subs)) if root_numeric else _numeric(r, subs),
+    if root_numeric is None:
+        root_numeric = {r: _numeric(r, subs) for r in roots}
+    root_vals = np.fromiter(
+        (root_numeric[r] if r in root_numeric else _numeric(r, subs) for r in roots),
+        dtype=np.float64,
+        count=len(roots),
     )
+    all_sorted_roots = [roots[i] for i in np.argsort(root_vals, kind="stable")]
 
     # Collect marker positions for draw_vertical_lines
     factor_marker_positions: Dict[Any, List[float]] = {}
 
     # Draw horizontal sign lines for each factor
     for i, factor in enumerate(factors):
-        expression = factor.get("expression")
-        exponent = factor.get("exponent")
-
-        # Handle both old format (single "root") and new format (multiple "roots")
-        factor_roots = (
-            factor.get("roots", [factor.get("root")])
-            if factor.get("root") is not None or factor.get("roots")
-            else []
-        )
+        expression = factor.expression
+        exponent = factor.exponent
 
         # Use LaTeX rendering for proper mathematical notation.
         # Prefer a precomputed override (keeps `x` first for linear factors).
-        expression_latex_override = factor.get("expression_latex")
+        expression_latex_override = factor.expression_latex
         if expression_latex_override:
             expression_latex = expression_latex_override
         else:
             try:
-                expression_latex = sp.latex(expression, ln_notation=True)
+                expression_latex = _latex(expression)
             except:
                 # Fallback to string representation if latex fails
                 expression_latex = str(expression)
@@ -779,7 +832,7 @@ def draw_factors(
         else:
             s = f"${expression_latex}$"
 
-        plt.text(
+        ax.text(
             x=-0.1,
             y=(i + 1) * dy,
             s=s,
@@ -796,7 +849,7 @@ def draw_factors(
             full_expr = expr
 
         # Set of the factor's own roots for O(1) lookup
-        factor_own_roots = set(r for r in factor_roots if r != -np.inf)
+        factor_own_roots = set(factor.roots)
 
         # If no real roots AND no global roots (constant factor with no breakpoints)
         if (not factor_own_roots) and (not all_sorted_roots):
@@ -889,7 +942,7 @@ def draw_factors(
 
             if root in factor_own_roots:
                 # Factor's own root → show "0"
-                plt.text(
+                ax.text(
                     x=root_pos,
                     y=y_pos,
                     s=f"$0$",
@@ -903,7 +956,7 @@ def draw_factors(
                 sgn = _eval_sign_at(full_expr, x, root_numeric[root], subs)
                 if sgn is None:
                     # Factor is undefined at this point → show "×"
-                    plt.text(
+                    ax.text(
                         x=root_pos + 0.005,
                         y=y_pos,
                         s=f"$\\times$",
@@ -942,7 +995,7 @@ def draw_function(
         y = (len(factors) + 1) * dy
     else:
         y = dy
-    plt.text(
+    ax.text(
         x=-0.1,
         y=y,
         s=f"${fn_name}$" if fn_name else f"$f({str(x)})$",
@@ -964,7 +1017,7 @@ def draw_function(
                 lw=2,
                 alpha=0.6,
             )
-            plt.text(
+            ax.text(
                 x=(x_min + x_max) / 2,
                 y=y,
                 s=f"$\\times$",
@@ -1024,7 +1077,7 @@ def draw_function(
                 lw=2,
                 alpha=0.6,
             )
-            plt.text(
+            ax.text(
                 x=(pos_interval[0] + pos_interval[1]) / 2,
                 y=y,
                 s=f"$\\times$",
@@ -1069,7 +1122,7 @@ def draw_function(
                 is_singularity = False
 
         if not is_singularity:
-            plt.text(
+            ax.text(
                 x=root_pos,
                 y=y,
                 s=f"$0$",
@@ -1078,7 +1131,7 @@ def draw_function(
                 va="center",
             )
         else:
-            plt.text(
+            ax.text(
                 x=root_pos + 0.005,
                 y=y,
                 s=f"$\\times$",
@@ -1111,15 +1164,9 @@ def draw_vertical_lines(
         else:
             # Fallback: compute from factor roots only (legacy behavior)
             for i, factor in enumerate(factors):
-                factor_roots = (
-                    factor.get("roots", [factor.get("root")])
-                    if factor.get("root") is not None or factor.get("roots")
-                    else []
-                )
-                for root in factor_roots:
-                    if root != -np.inf:
-                        y_zero = (i + 1) * dy
-                        y_zeros_dict.setdefault(root, []).append(y_zero)
+                for root in factor.roots:
+                    y_zero = (i + 1) * dy
+                    y_zeros_dict.setdefault(root, []).append(y_zero)
 
         # Add y position of zero from function
         y_function = (len(factors) + 1) * dy
@@ -1162,8 +1209,36 @@ def draw_vertical_lines(
                     )
 
 
-def make_axis(x, fontsize=24, labelpad=-15):
-    fig, ax = plt.subplots()
+# Figure reused across plot() calls; building a new Figure per chart is one of
+# the most expensive parts of drawing these small charts. Figures are created
+# through the object-oriented API with an Agg canvas, bypassing pyplot's global
+# state, so other directives' plt.gcf()/plt.gca() calls never draw onto them.
+# Agg is what pyplot attached before, so tight_layout measures text exactly as
+# it used to; savefig(format="svg") still writes through the SVG backend.
+_SHARED_FIG: Figure | None = None
+
+
+def _new_figure() -> Figure:
+    """Create a Figure attached to an Agg canvas, without pyplot."""
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def _shared_figure():
+    """Return the module's shared figure, cleared and ready for a new chart."""
+    global _SHARED_FIG
+    if _SHARED_FIG is None:
+        _SHARED_FIG = _new_figure()
+    else:
+        _SHARED_FIG.clear()
+    return _SHARED_FIG
+
+
+def make_axis(x, fontsize=24, labelpad=-15, fig=None):
+    if fig is None:
+        fig = _new_figure()
+    ax = fig.add_subplot(111)
 
     # Remove y-axis spines
     ax.spines["left"].set_color("none")  # Remove the left y-axis
@@ -1191,7 +1266,7 @@ def make_axis(x, fontsize=24, labelpad=-15):
     ax.set_xlabel(f"${str(x)}$", fontsize=fontsize, loc="right", labelpad=labelpad)
 
     # Remove tick labels on y-axis
-    plt.yticks([])
+    ax.set_yticks([])
 
     # Set x-limits
     ax.set_xlim(-0.05, 1.05)
@@ -1199,53 +1274,48 @@ def make_axis(x, fontsize=24, labelpad=-15):
     return fig, ax
 
 
-def plot(
-    f,
-    x=None,
-    fn_name=None,
-    color=True,
-    include_factors=True,
-    generic_labels=False,
-    small_figsize=False,
-    figsize=None,
-    domain=None,
-    assumptions=None,
-    fontsize=24,
-    labelpad=-15,
-):
-    """Draws a sign chart for a function f (polynomial, rational, or transcendental).
+# Analysis results keyed on the inputs that determine the chart's geometry
+# (roots, factor rows and sign intervals). Presentation options such as colors,
+# labels and font sizes are deliberately excluded so that re-rendering the same
+# function with different styling skips the SymPy work entirely.
+_ANALYSIS_CACHE: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+_ANALYSIS_CACHE_MAX = 256
 
-    Args:
-        f (sp.Expr, str):
-            Function expression. May be a sympy.Expr or str. Supports polynomials,
-            rational functions, and transcendental functions (sin, cos, exp, log, etc.).
-        x (sp.symbols, str, optional):
-            Variable in the function
-        fn_name (str, optional):
-            Name of the function. Defaults `None`.
-        color (bool, optional):
-            Enables coloring of sign chart. Default: `True`.
-        include_factors (bool, optional):
-            Includes all linear factors of f(x) for polynomials. For non-polynomial
-            functions, this shows the function name only. Default: `True`.
-        generic_label (bool, optional):
-            Uses generic labels for roots: x_1, x_2, ..., x_N. Default: `False`.
-        small_figsize (bool, optional):
-            Enables rescaling of the figure for a smaller figure size. Default: `False`.
-        domain (tuple, optional):
-            Domain (x_min, x_max) for searching zeros numerically in transcendental functions.
-            If None, uses a default range or symbolic solving only. Example: (-10, 10)
-        fontsize (int, optional):
-            Font size for all text in the chart. Default: 24.
-        labelpad (float, optional):
-            Padding for the x-axis label. Negative values move it closer to the axis. Default: -15.
+
+def _analysis_key(f, x, domain, assumptions) -> Tuple[Any, ...]:
+    """Build a hashable cache key for :func:`_analyze`."""
+    f_key = f if isinstance(f, str) else sp.srepr(f)
+    if x is None or isinstance(x, str):
+        x_key = x
+    else:
+        x_key = sp.srepr(x)
+    domain_key = tuple(float(d) for d in domain) if domain else None
+    assumptions_key = str(assumptions).strip() if assumptions else None
+    return (f_key, x_key, domain_key, assumptions_key)
+
+
+def _safe_zeros_and_singularities(f, x, domain) -> Tuple[List[Any], List[Any]]:
+    """Run :func:`get_zeros_and_singularities`, treating solver failures as "none found"."""
+    try:
+        result = get_zeros_and_singularities(f, x, domain=domain)
+    except Exception:
+        return [], []
+    return result["zeros"], result["singularities"]
+
+
+def _analyze(f, x=None, domain=None, assumptions=None) -> Dict[str, Any]:
+    """Compute the sign-chart structure of f (cached).
 
     Returns:
-        fig (plt.figure)
-            matplotlib figure.
-        ax (plt.Axis)
-            matplotlib axis.
+        dict with the keys 'f', 'x', 'factors', 'roots', 'root_numeric',
+        'singularities_set' and 'param_subs'. The returned objects are shared
+        between calls and must be treated as read-only.
     """
+    key = _analysis_key(f, x, domain, assumptions)
+    cached = _ANALYSIS_CACHE.get(key)
+    if cached is not None:
+        return cached
+
     if isinstance(f, str):
         f = sp.sympify(f)
 
@@ -1273,93 +1343,64 @@ def plot(
         param_symbols, str(assumptions).strip() if assumptions else None
     )
 
-    if color:
-        color_pos = "red"
-        color_neg = "blue"
-    else:
-        color_pos = color_neg = "black"
-
-    # Determine function type and extract zeros/singularities
+    # Determine function type once and dispatch on cheap boolean checks.
+    numer, denom = f.as_numer_denom()
     is_polynomial = f.is_polynomial()
-    is_rational = False
+    is_rational = (
+        not is_polynomial and denom != 1 and denom.is_polynomial() and numer.is_polynomial()
+    )
     singularities: List[Any] = []
 
     if is_polynomial:
         # Use existing polynomial factorization
         factors = get_factors(polynomial=f, x=x)
         factors = sort_factors(factors)
-    else:
-        # Check if it's a rational function
-        try:
-            numer, denom = f.as_numer_denom()
-            if denom != 1 and denom.is_polynomial() and numer.is_polynomial():
-                is_rational = True
-                # Handle as rational function. Use a cancelled form so removable
-                # discontinuities don't get marked as poles.
-                f = sp.cancel(f)
-                numer_c, denom_c = f.as_numer_denom()
-
-                p_factors = get_factors(polynomial=numer_c, x=x) if numer_c != 1 else []
-                q_factors = get_factors(polynomial=denom_c, x=x) if denom_c != 1 else []
-
-                for fac in p_factors:
-                    fac["is_denominator"] = False
-                for fac in q_factors:
-                    fac["is_denominator"] = True
-
-                singularities = [
-                    fac.get("root")
-                    for fac in q_factors
-                    if fac.get("root") is not None and fac.get("root") != -np.inf
-                ]
+    elif is_rational:
+        # Handle as rational function. Use a cancelled form so removable
+        # discontinuities don't get marked as poles.
+        f = sp.cancel(f)
+        numer_c, denom_c = f.as_numer_denom()
 
-                factors = p_factors + q_factors
-                factors = sort_factors(factors)
-            else:
-                # General transcendental or composite function
-                is_rational = False
-                # Use general zero finding
-                result = get_zeros_and_singularities(f, x, domain=domain)
-                zeros = result["zeros"]
-                singularities = result["singularities"]
-
-                # Extract factors from transcendental function
-                factors = get_transcendental_factors(f, x, zeros, singularities)
-                factors = sort_factors(factors)
-                # Now we can show factors for transcendental functions too!
-        except:
-            # Fallback: general function
-            result = get_zeros_and_singularities(f, x, domain=domain)
-            zeros = result["zeros"]
-            singularities = result["singularities"]
+        p_factors = get_factors(polynomial=numer_c, x=x) if numer_c != 1 else []
+        q_factors = get_factors(polynomial=denom_c, x=x) if denom_c != 1 else []
+
+        q_factors = [replace(fac, is_denominator=True) for fac in q_factors]
+
+        singularities = [r for fac in q_factors for r in fac.roots]
+
+        factors = p_factors + q_factors
+        factors = sort_factors(factors)
+    else:
+        # General transcendental or composite function
+        zeros, singularities = _safe_zeros_and_singularities(f, x, domain)
 
-            # Extract factors
-            factors = get_transcendental_factors(f, x, zeros, singularities)
-            factors = sort_factors(factors)
+        # Extract factors from transcendental function
+        factors = get_transcendental_factors(f, x, zeros, singularities)
+        factors = sort_factors(factors)
 
     # Add real-domain breakpoints for functions like log(x) and sqrt(x)
     domain_breaks, domain_set = _domain_breakpoints_real(sp.sympify(f), x)
 
-    # Create figure
-    fig, ax = make_axis(x, fontsize=fontsize, labelpad=labelpad)
+    # Extract roots. Deduplicate on the canonical srepr form (O(1) per root
+    # instead of SymPy equality checks against every root collected so far).
+    seen: Dict[str, Any] = {}
+
+    def add_root(r):
+        if r == -np.inf:
+            return
+        key = sp.srepr(r)
+        if key not in seen:
+            seen[key] = r
 
-    # Extract roots - handle both old format (single "root") and new format (multiple "roots")
-    roots = []
     for factor in factors:
-        if "roots" in factor and factor["roots"]:
-            # New format: multiple roots per factor
-            for r in factor["roots"]:
-                if r != -np.inf and r not in roots:
-                    roots.append(r)
-        elif "root" in factor and factor["root"] != -np.inf:
-            # Old format: single root per factor
-            if factor["root"] not in roots:
-                roots.append(factor["root"])
+        for r in factor.roots:
+            add_root(r)
 
     # Ensure domain boundary points (finite endpoints) are included to split intervals
     for b in domain_breaks:
-        if b != -np.inf and b not in roots:
-            roots.append(b)
+        add_root(b)
+
+    roots = list(seen.values())
 
     # Sort roots (support parameter-dependent roots)
     root_numeric: Dict[Any, float] = {}
@@ -1370,7 +1411,9 @@ def plot(
             # If a root can't be evaluated numerically, keep it but sort to the end
             root_numeric[r] = float("inf")
 
-    roots = sorted(roots, key=lambda r: root_numeric.get(r, float("inf")))
+    # argsort runs in C; a stable sort keeps the collection order for ties.
+    root_vals = np.fromiter((root_numeric[r] for r in roots), dtype=np.float64, count=len(roots))
+    roots = [roots[i] for i in np.argsort(root_vals, kind="stable")]
 
     # Convert singularities (often computed separately) into the canonical root objects
     # we use for positioning/labeling, by matching numerically.
@@ -1401,6 +1444,90 @@ def plot(
             if contains is sp.S.false:
                 singularities_set.add(r)
 
+    analysis = {
+        "f": f,
+        "x": x,
+        "factors": factors,
+        "roots": roots,
+        "root_numeric": root_numeric,
+        "singularities_set": singularities_set,
+        "param_subs": param_subs,
+    }
+
+    if len(_ANALYSIS_CACHE) >= _ANALYSIS_CACHE_MAX:
+        _ANALYSIS_CACHE.pop(next(iter(_ANALYSIS_CACHE)))
+    _ANALYSIS_CACHE[key] = analysis
+    return analysis
+
+
+def plot(
+    f,
+    x=None,
+    fn_name=None,
+    color=True,
+    include_factors=True,
+    generic_labels=False,
+    small_figsize=False,
+    figsize=None,
+    domain=None,
+    assumptions=None,
+    fontsize=24,
+    labelpad=-15,
+):
+    """Draws a sign chart for a function f (polynomial, rational, or transcendental).
+
+    Args:
+        f (sp.Expr, str):
+            Function expression. May be a sympy.Expr or str. Supports polynomials,
+            rational functions, and transcendental functions (sin, cos, exp, log, etc.).
+        x (sp.symbols, str, optional):
+            Variable in the function
+        fn_name (str, optional):
+            Name of the function. Defaults `None`.
+        color (bool, optional):
+            Enables coloring of sign chart. Default: `True`.
+        include_factors (bool, optional):
+            Includes all linear factors of f(x) for polynomials. For non-polynomial
+            functions, this shows the function name only. Default: `True`.
+        generic_label (bool, optional):
+            Uses generic labels for roots: x_1, x_2, ..., x_N. Default: `False`.
+        small_figsize (bool, optional):
+            Enables rescaling of the figure for a smaller figure size. Default: `False`.
+        domain (tuple, optional):
+            Domain (x_min, x_max) for searching zeros numerically in transcendental functions.
+            If None, uses a default range or symbolic solving only. Example: (-10, 10)
+        fontsize (int, optional):
+            Font size for all text in the chart. Default: 24.
+        labelpad (float, optional):
+            Padding for the x-axis label. Negative values move it closer to the axis. Default: -15.
+
+    Returns:
+        fig (matplotlib.figure.Figure)
+            matplotlib figure. The figure is shared between calls and is cleared
+            by the next call to `plot`.
+        ax (matplotlib.axes.Axes)
+            matplotlib axis.
+    """
+    # The symbolic analysis only depends on the function, variable, domain and
+    # assumptions; styling changes reuse the cached result.
+    analysis = _analyze(f, x=x, domain=domain, assumptions=assumptions)
+    f = analysis["f"]
+    x = analysis["x"]
+    factors = analysis["factors"]
+    roots = analysis["roots"]
+    root_numeric = analysis["root_numeric"]
+    singularities_set = analysis["singularities_set"]
+    param_subs = analysis["param_subs"]
+
+    if color:
+        color_pos = "red"
+        color_neg = "blue"
+    else:
+        color_pos = color_neg = "black"
+
+    # Create figure
+    fig, ax = make_axis(x, fontsize=fontsize, labelpad=labelpad, fig=_shared_figure())
+
     # Map roots to positions
     num_roots = len(roots)
     x_min = -0.05
@@ -1409,10 +1536,10 @@ def plot(
     root_positions = dict(zip(roots, positions))
 
     # Set tick marks for roots of the polynomial
-    plt.xticks(
+    ax.set_xticks(
         ticks=positions,
         labels=[
-            f"${sp.latex(root, ln_notation=True)}$" if not generic_labels else f"$x_{i + 1}$"
+            f"${_latex(root)}$" if not generic_labels else f"$x_{i + 1}$"
             for i, root in enumerate(roots)
         ],
         fontsize=fontsize,
@@ -1455,9 +1582,9 @@ def plot(
     )
 
     # Remove tick labels on y-axis
-    plt.yticks([])
+    ax.set_yticks([])
 
-    plt.xlim(x_min, x_max)
+    ax.set_xlim(x_min, x_max)
 
     if include_factors:
         if figsize:
@@ -1479,7 +1606,7 @@ def plot(
         factor_marker_positions=factor_marker_positions,
     )
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     return fig, ax
 
@@ -1520,14 +1647,16 @@ def _safe_literal(val: str):
     Returns:
         Evaluated value or None if evaluation fails
     """
-    import ast
-
     try:
         return ast.literal_eval(val)
     except Exception:
         return None
 
 
+_TRUE_STRINGS = frozenset({"", "true", "yes", "on", "1"})
+_FALSE_STRINGS = frozenset({"false", "no", "off", "0"})
+
+
 def _parse_bool(val, default: bool | None = None) -> bool | None:
     """
     Parse a value as a boolean.
@@ -1544,11 +1673,9 @@ def _parse_bool(val, default: bool | None = None) -> bool | None:
     if isinstance(val, bool):
         return val
     s = str(val).strip().lower()
-    if s == "":
-        return True
-    if s in {"true", "yes", "on", "1"}:
+    if s in _TRUE_STRINGS:
         return True
-    if s in {"false", "no", "off", "0"}:
+    if s in _FALSE_STRINGS:
         return False
     return default
 
@@ -1581,86 +1708,155 @@ def _parse_tuple(val, element_type=float):
     return None
 
 
-def _strip_root_svg_size(svg_text: str) -> str:
+# Parsers for the option schema below: (raw value, default) -> parsed value.
+# Empty/missing values fall back to the default.
+_OPTION_PARSERS = {
+    "bool": _parse_bool,
+    "int": lambda val, default: int(val) if val else default,
+    "float": lambda val, default: float(val) if val else default,
+    "tuple_float": lambda val, default: _parse_tuple(val, float) if val else default,
+}
+
+# (option name, kind, default) for the plot options of the directive.
+_OPTION_SCHEMA = (
+    ("factors", "bool", True),
+    ("color", "bool", True),
+    ("generic_labels", "bool", False),
+    ("small_figsize", "bool", False),
+    ("figsize", "tuple_float", None),
+    ("fontsize", "int", 24),
+    ("labelpad", "float", -15),
+)
+
+
+def _parse_options(merged: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse the plot options in `merged` according to `_OPTION_SCHEMA`."""
+    return {
+        name: _OPTION_PARSERS[kind](merged.get(name), default)
+        for name, kind, default in _OPTION_SCHEMA
+    }
+
+
+_SVG_ROOT_RE = re.compile(rb"<svg\b[^>]*>")
+_WIDTH_RE = re.compile(r'\swidth="[^"]+"')
+_HEIGHT_RE = re.compile(r'\sheight="[^"]+"')
+_STYLE_RE = re.compile(r'style="([^"]*)"')
+
+
+def _fused_header(m: re.Match, alt: str | None, width_opt: str | None, strip_size: bool) -> bytes:
     """
-    Remove width/height attributes from the root <svg> tag.
+    Rewrite the root <svg> tag in a single pass.
 
-    This allows CSS to control the SVG size.
+    Optionally removes the width/height attributes (so CSS controls the size),
+    then adds classes, aria-label and width styling.
 
     Args:
-        svg_text: Raw SVG content
+        m: Match of the root <svg> tag (bytes)
+        alt: Alt text used as aria-label
+        width_opt: Value of the directive's width option
+        strip_size: Remove width/height when the tag has a viewBox
 
     Returns:
-        str: SVG with width/height removed from root tag
+        bytes: The rewritten tag
     """
+    tag = m.group(0).decode("utf-8")
+    if strip_size and "viewBox" in tag:
+        tag = _WIDTH_RE.sub("", tag)
+        tag = _HEIGHT_RE.sub("", tag)
+    if "class=" not in tag:
+        tag = tag[:-1] + ' class="graph-inline-svg"' + ">"
+    else:
+        tag = tag.replace('class="', 'class="graph-inline-svg ')
+    if alt and "aria-label=" not in tag:
+        tag = tag[:-1] + f' role="img" aria-label="{alt}"' + ">"
+    if width_opt:
+        wval = width_opt.strip()
+        if wval.isdigit():
+            wval += "px"
+        style_frag = f"width:{wval}; height:auto; display:block; margin:0 auto;"
+        if "style=" in tag:
+            tag = _STYLE_RE.sub(
+                lambda mm: f'style="{mm.group(1)}; {style_frag}"',
+                tag,
+                count=1,
+            )
+        else:
+            tag = tag[:-1] + f' style="{style_frag}"' + ">"
+    return tag.encode("utf-8")
+
+
+# Id-rewritten SVG bytes per (content hash, occurrence), so the rewrite runs at
+# most once per chart per process.
+_REWRITTEN_SVG_CACHE: Dict[Tuple[str, int], bytes] = {}
+_REWRITTEN_SVG_CACHE_MAX = 256
 
-    def repl(m):
-        tag = m.group(0)
-        tag = re.sub(r'\swidth="[^"]+"', "", tag)
-        tag = re.sub(r'\sheight="[^"]+"', "", tag)
-        return tag
 
-    return re.sub(r"<svg\b[^>]*>", repl, svg_text, count=1)
+_ID_RE = re.compile(rb'\bid="([^"]+)"')
+_URL_REF_RE = re.compile(rb"url\(#\s*([^\)\s]+)\s*\)")
+_HREF_REF_RE = re.compile(rb'(xlink:href|href)\s*=\s*(["\'])#\s*([^"\']+)\s*\2')
+_SKIP_ID_PREFIXES = (
+    b"DejaVu",
+    b"CM",
+    b"STIX",
+    b"Nimbus",
+    b"Bitstream",
+    b"Arial",
+    b"Times",
+    b"Helvetica",
+)
 
 
-def _rewrite_ids(txt: str, prefix: str) -> str:
+def _rewrite_ids(data: bytes, prefix: bytes) -> bytes:
     """
     Rewrite all id attributes in SVG to avoid conflicts.
 
     When multiple SVGs are on the same page, id conflicts can cause
     rendering issues. This function prefixes all ids with a unique prefix.
 
+    Works on the raw (UTF-8) bytes; every pattern involved is ASCII, so the
+    document never needs to be decoded.
+
     Args:
-        txt: SVG content
+        data: SVG content
         prefix: Prefix to add to all ids
 
     Returns:
-        str: SVG with rewritten ids
+        bytes: SVG with rewritten ids
     """
-    ids = re.findall(r'\bid="([^"]+)"', txt)
+    ids = _ID_RE.findall(data)
     if not ids:
-        return txt
-    skip_prefixes = (
-        "DejaVu",
-        "CM",
-        "STIX",
-        "Nimbus",
-        "Bitstream",
-        "Arial",
-        "Times",
-        "Helvetica",
-    )
+        return data
     mapping = {}
     for i in ids:
-        if i.startswith(skip_prefixes):
+        if i.startswith(_SKIP_ID_PREFIXES):
             continue
-        mapping[i] = f"{prefix}{i}"
+        mapping[i] = prefix + i
     if not mapping:
-        return txt
+        return data
 
-    def repl_id(m: re.Match) -> str:
+    def repl_id(m: re.Match) -> bytes:
         old = m.group(1)
         new = mapping.get(old, old)
-        return f'id="{new}"'
+        return b'id="' + new + b'"'
 
-    txt = re.sub(r'\bid="([^"]+)"', repl_id, txt)
+    data = _ID_RE.sub(repl_id, data)
 
-    def repl_url(m: re.Match) -> str:
+    def repl_url(m: re.Match) -> bytes:
         old = m.group(1).strip()
         new = mapping.get(old, old)
-        return f"url(#{new})"
+        return b"url(#" + new + b")"
 
-    txt = re.sub(r"url\(#\s*([^\)\s]+)\s*\)", repl_url, txt)
+    data = _URL_REF_RE.sub(repl_url, data)
 
-    def repl_href(m: re.Match) -> str:
+    def repl_href(m: re.Match) -> bytes:
         attr = m.group(1)
         quote = m.group(2)
         old = m.group(3).strip()
         new = mapping.get(old, old)
-        return f"{attr}={quote}#{new}{quote}"
+        return attr + b"=" + quote + b"#" + new + quote
 
-    txt = re.sub(r'(xlink:href|href)\s*=\s*(["\'])#\s*([^"\']+)\s*\2', repl_href, txt)
-    return txt
+    data = _HREF_REF_RE.sub(repl_href, data)
+    return data
 
 
 # ------------------------------------
@@ -1821,10 +2017,14 @@ class SignChart2Directive(SphinxDirective):
                 f_name = None
 
         # Parse options
-        include_factors = _parse_bool(merged.get("factors"), default=True)
-        use_color = _parse_bool(merged.get("color"), default=True)
-        generic_labels = _parse_bool(merged.get("generic_labels"), default=False)
-        small_figsize = _parse_bool(merged.get("small_figsize"), default=False)
+        parsed = _parse_options(merged)
+        include_factors = parsed["factors"]
+        use_color = parsed["color"]
+        generic_labels = parsed["generic_labels"]
+        small_figsize = parsed["small_figsize"]
+        custom_figsize = parsed["figsize"]
+        custom_fontsize = parsed["fontsize"]
+        custom_labelpad = parsed["labelpad"]
         explicit_name = merged.get("name")
         debug_mode = "debug" in merged
 
@@ -1832,18 +2032,6 @@ class SignChart2Directive(SphinxDirective):
         domain_val = merged.get("domain")
         custom_domain, domain_assumptions = _parse_domain_option(domain_val)
 
-        # Parse figsize
-        figsize_val = merged.get("figsize")
-        custom_figsize = _parse_tuple(figsize_val, float) if figsize_val else None
-
-        # Parse fontsize
-        fontsize_val = merged.get("fontsize")
-        custom_fontsize = int(fontsize_val) if fontsize_val else 24
-
-        # Parse labelpad
-        labelpad_val = merged.get("labelpad")
-        custom_labelpad = float(labelpad_val) if labelpad_val else -15
-
         # Hash includes all plot parameters
         content_hash = _hash_key(
             f_expr,
@@ -1867,6 +2055,7 @@ class SignChart2Directive(SphinxDirective):
         abs_svg = os.path.join(abs_dir, svg_name)
 
         regenerate = ("nocache" in merged) or not os.path.exists(abs_svg)
+        rendered_svg = None
         if regenerate:
             try:
                 # Render using embedded plot function
@@ -1887,8 +2076,11 @@ class SignChart2Directive(SphinxDirective):
                     plot_kwargs["figsize"] = custom_figsize
 
                 fig, ax = plot(**plot_kwargs)
-                fig.savefig(abs_svg, format="svg", bbox_inches="tight", transparent=True)
-                plt.close(fig)
+                # Render to memory and write that to disk, so the SVG is not read back.
+                buf = io.BytesIO()
+                fig.savefig(buf, format="svg", bbox_inches="tight", transparent=True)
+                rendered_svg = buf.getvalue()
+                Path(abs_svg).write_bytes(rendered_svg)
             except Exception as e:
                 return [
                     self.state_machine.reporter.error(
@@ -1913,60 +2105,56 @@ class SignChart2Directive(SphinxDirective):
         except Exception:
             pass
 
-        try:
-            raw_svg = open(abs_svg, "r", encoding="utf-8").read()
-        except Exception as e:
-            return [
-                self.state_machine.reporter.error(
-                    f"signchart-2 inline: could not read SVG: {e}", line=self.lineno
-                )
-            ]
-
-        if not debug_mode and "viewBox" in raw_svg:
-            raw_svg = _strip_root_svg_size(raw_svg)
-
-        if not debug_mode:
-            raw_svg = _rewrite_ids(raw_svg, f"sgc2_{content_hash}_{uuid.uuid4().hex[:6]}_")
+        # The same chart can appear several times on one page; each copy gets
+        # its own ids so url(#...) references never resolve into another copy
+        # (which may be hidden). temp_data is reset for every document read,
+        # so the counts (and the ids) are stable across rebuilds.
+        occurrences = self.env.temp_data.setdefault("signchart2_occurrences", {})
+        occurrence = occurrences.get(content_hash, 0)
+        occurrences[content_hash] = occurrence + 1
+        cache_key = (content_hash, occurrence)
+
+        raw_svg = None
+        if not debug_mode and not regenerate:
+            raw_svg = _REWRITTEN_SVG_CACHE.get(cache_key)
+
+        if raw_svg is None:
+            if rendered_svg is not None:
+                raw_svg = rendered_svg
+            else:
+                try:
+                    raw_svg = Path(abs_svg).read_bytes()
+                except Exception as e:
+                    return [
+                        self.state_machine.reporter.error(
+                            f"signchart-2 inline: could not read SVG: {e}", line=self.lineno
+                        )
+                    ]
+
+            if not debug_mode:
+                prefix = f"sgc2_{content_hash}_{occurrence}_"
+                raw_svg = _rewrite_ids(raw_svg, prefix.encode("ascii"))
+                if len(_REWRITTEN_SVG_CACHE) >= _REWRITTEN_SVG_CACHE_MAX:
+                    _REWRITTEN_SVG_CACHE.pop(next(iter(_REWRITTEN_SVG_CACHE)))
+                _REWRITTEN_SVG_CACHE[cache_key] = raw_svg
 
         alt_default = "Fortegnsskjema"
         alt = merged.get("alt", alt_default)
 
         width_opt = merged.get("width")
-        percent = isinstance(width_opt, str) and width_opt.strip().endswith("%")
 
-        def _augment(m):
-            """Add classes, aria-label, and width styling to root SVG tag."""
-            tag = m.group(0)
-            if "class=" not in tag:
-                tag = tag[:-1] + ' class="graph-inline-svg"' + ">"
-            else:
-                tag = tag.replace('class="', 'class="graph-inline-svg ')
-            if alt and "aria-label=" not in tag:
-                tag = tag[:-1] + f' role="img" aria-label="{alt}"' + ">"
-            if width_opt:
-                if percent:
-                    wval = width_opt.strip()
-                else:
-                    wval = width_opt.strip()
-                    if wval.isdigit():
-                        wval += "px"
-                style_frag = f"width:{wval}; height:auto; display:block; margin:0 auto;"
-                if "style=" in tag:
-                    tag = re.sub(
-                        r'style="([^"]*)"',
-                        lambda mm: f'style="{mm.group(1)}; {style_frag}"',
-                        tag,
-                        count=1,
-                    )
-                else:
-                    tag = tag[:-1] + f' style="{style_frag}"' + ">"
-            return tag
-
-        raw_svg = re.sub(r"<svg\b[^>]*>", _augment, raw_svg, count=1)
+        # Size stripping and class/aria/width augmentation in one header rewrite
+        raw_svg = _SVG_ROOT_RE.sub(
+            functools.partial(
+                _fused_header, alt=alt, width_opt=width_opt, strip_size=not debug_mode
+            ),
+            raw_svg,
+            count=1,
+        )
 
         figure = nodes.figure()
         figure.setdefault("classes", []).extend(["adaptive-figure", "signchart-figure", "no-click"])
-        raw_node = nodes.raw("", raw_svg, format="html")
+        raw_node = nodes.raw("", raw_svg.decode("utf-8"), format="html")
         raw_node.setdefault("classes", []).extend(["graph-image", "no-click", "no-scaled-link"])
         figure += raw_node
 
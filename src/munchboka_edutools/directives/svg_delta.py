@@ -12,11 +12,30 @@ This reduces storage from O(N × size) to O(1 × size + N × changes).
 For typical interactive graphs: 100MB → 2-5MB (95-98% reduction).
 """
 
+from __future__ import annotations
+
+import base64
+import gzip
 import json
+import os
 import re
-from typing import Dict, List, Tuple, Any
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Tuple, Any
+
+import numpy as np
+from lxml import etree as LET
 
-import xml.etree.ElementTree as ET
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 
 def setup(app):
@@ -34,12 +53,79 @@ def setup(app):
     }
 
 
-_SVG_XML_DECL_RE = re.compile(r"<\?xml[^?]*\?>", flags=re.IGNORECASE)
-_SVG_DOCTYPE_RE = re.compile(r"<!DOCTYPE[^>]*>", flags=re.IGNORECASE)
-_SVG_METADATA_RE = re.compile(r"<metadata[\s\S]*?</metadata>", flags=re.IGNORECASE)
+# XML declaration, DOCTYPE and <metadata> block; see `_strip_svg_prologue`.
+_SVG_PROLOGUE_RE = re.compile(
+    r"<\?xml[^?]*\?>|<!DOCTYPE[^>]*>|<metadata[\s\S]*?</metadata>", flags=re.IGNORECASE
+)
+_METADATA_END = "</metadata>"
+# Top-level/structural nodes that never receive an auto id.
+_UNTRACKED_TAGS = frozenset({"svg", "defs", "style", "metadata", "title", "desc"})
+# Start tag of an element that would receive an auto id in
+# `_prepare_svg_for_deltas`: not a closing tag/comment/PI, not one of
+# `_UNTRACKED_TAGS`, and without a non-empty id attribute.
+_ANON_ELEMENT_RE = re.compile(
+    r"<(?![/!?])(?!(?:svg|defs|style|metadata|title|desc)[\s/>])(?![^>]*\sid=[\"'][^\"'])"
+)
+
+# Attributes never reported in deltas: `id` is the match key itself and
+# `clip-path` points at per-render clipPath ids.
+_IGNORED_DIFF_ATTRS = frozenset({"id", "clip-path"})
+
+# lxml reports namespaced attributes in Clark notation: "{ns}local".
+_XLINK_HREF = "{http://www.w3.org/1999/xlink}href"
+
+_NUM_RE = re.compile(r"[-+]?(?:\d*\.\d+|\d+)(?:[eE][-+]?\d+)?")
+# Path command letters and commas -> spaces, leaving whitespace-separated numbers.
+_PATH_SEPARATORS = str.maketrans(dict.fromkeys("MmLlHhVvCcSsQqTtAaZz,", " "))
+_OWNER_GROUP_ID_RE = re.compile(r"^(?:line2d|patch|text|matplotlib\.axis|xtick|ytick)_")
+_VOLATILE_ID_RE = re.compile(r"^(?:p|m)[0-9a-fA-F]{6,}$")
+_MAJOR_REGION_PREFIXES = ("axes_", "legend_")
+
+# Parsers shared by every frame (lxml locks a parser's context while it is in
+# use). Both drop blank text the same way, so a tree from the strict prepare
+# pass can be diffed as-is.
+_PREPARE_PARSER = LET.XMLParser(recover=False, remove_blank_text=True, huge_tree=True)
+_FRAME_PARSER = LET.XMLParser(recover=True, remove_blank_text=True)
+
+# Clark-notation tag -> local name. SVG output uses a few dozen distinct tags,
+# so each one is split only once per process.
+_LOCALNAME_CACHE: Dict[str, str] = {}
+
+
+def _localname(tag: str) -> str:
+    """Return the local part of an element tag (``"{ns}path"`` -> ``"path"``)."""
+    local = _LOCALNAME_CACHE.get(tag)
+    if local is None:
+        local = _LOCALNAME_CACHE[tag] = tag.rpartition("}")[2]
+    return local
+
+
+def _strip_svg_prologue(svg: str) -> str:
+    """Remove the XML declaration, DOCTYPE and ``<metadata>`` blocks."""
+    root_start = svg.find("<svg")
+    if root_start == -1:
+        return _SVG_PROLOGUE_RE.sub("", svg)
+    # A declaration or DOCTYPE may only precede the root element, so only
+    # that (short) head goes through the regex.
+    if root_start:
+        svg = _SVG_PROLOGUE_RE.sub("", svg[:root_start]) + svg[root_start:]
+    # <metadata> blocks inside the document are cut out with str.find.
+    start = svg.find("<metadata")
+    while start != -1:
+        end = svg.find(_METADATA_END, start)
+        if end == -1:
+            break
+        svg = svg[:start] + svg[end + len(_METADATA_END) :]
+        start = svg.find("<metadata", start)
+    return svg
 
 
 def _prepare_svg_for_deltas(svg: str) -> str:
+    """Return the prepared SVG string (see `_prepare_frame`)."""
+    return _prepare_frame(svg)[0]
+
+
+def _prepare_frame(svg: str) -> Tuple[str, Any]:
     """Prepare SVGs for delta computation without breaking rendering.
 
     Goals:
@@ -49,34 +135,35 @@ def _prepare_svg_for_deltas(svg: str) -> str:
 
     Important: we do NOT overwrite existing ids, and we do NOT rewrite url(#..)
     references here. Many Matplotlib ids are stable already (line2d_*, text_*).
+
+    Returns ``(prepared_svg, root)``. ``root`` is the tree the ids were
+    assigned on, so callers can diff it instead of parsing ``prepared_svg``
+    again; it is None when no parse was needed.
     """
-    cleaned = _SVG_XML_DECL_RE.sub("", svg)
-    cleaned = _SVG_DOCTYPE_RE.sub("", cleaned)
-    cleaned = _SVG_METADATA_RE.sub("", cleaned)
+    cleaned = _strip_svg_prologue(svg)
 
-    try:
-        from lxml import etree as LET
-    except ImportError:
-        return cleaned
+    # Nothing to assign: skip the parse + serialize round-trip.
+    if not _ANON_ELEMENT_RE.search(cleaned):
+        return cleaned, None
 
     try:
-        parser = LET.XMLParser(recover=False, remove_blank_text=False, huge_tree=True)
-        root = LET.fromstring(cleaned.encode("utf-8"), parser)
+        root = LET.fromstring(cleaned.encode("utf-8"), _PREPARE_PARSER)
     except Exception:
         # Fall back to the cleaned raw SVG if strict parsing fails.
-        return cleaned
+        return cleaned, None
 
     counters: Dict[str, int] = {}
 
     for elem in root.iter():
-        if not isinstance(elem.tag, str):
+        tag = elem.tag
+        if not isinstance(tag, str):
             continue
         if elem.get("id"):
             continue
 
-        local = LET.QName(elem).localname
+        local = _localname(tag)
         # Skip top-level/structural nodes that rarely need ids.
-        if local in ("svg", "defs", "style", "metadata", "title", "desc"):
+        if local in _UNTRACKED_TAGS:
             continue
 
         idx = counters.get(local, 0)
@@ -85,178 +172,143 @@ def _prepare_svg_for_deltas(svg: str) -> str:
         # `path_26`, `patch_10`, etc.
         elem.set("id", f"mb_auto_{local}_{idx}")
 
-    return LET.tostring(root, encoding="unicode")
+    return LET.tostring(root, encoding="unicode"), root
 
 
-def compute_svg_deltas(svg_frames: List[str]) -> Tuple[str, List[Dict[str, Any]]]:
-    """
-    Compute deltas between SVG frames.
+# Frame diffs are independent of each other, so long animations are spread
+# over worker processes. Below this many frames the pool start-up (and each
+# worker re-parsing the base frame) costs more than it saves.
+_PARALLEL_MIN_FRAMES = 16
 
-    Args:
-        svg_frames: List of SVG strings (one per frame)
+# Base SVGs up to this size are embedded in the generated page, saving the
+# base.svg request before the first frame can render.
+_INLINE_BASE_SVG_MAX_BYTES = 256 * 1024
 
-    Returns:
-        Tuple of (base_svg, deltas) where:
-        - base_svg: First frame with all elements
-        - deltas: List of frame-specific changes
-    """
-    if not svg_frames:
-        raise ValueError("Need at least one frame")
+# Base-frame context of a worker process, built once by `_init_delta_worker`.
+_WORKER_BASE_CONTEXT: Dict[str, Any] | None = None
 
-    # Prepare SVGs so deltas become meaningful: remove metadata noise and add
-    # deterministic ids for anonymous elements.
-    prepared_frames = [_prepare_svg_for_deltas(s) for s in svg_frames]
 
-    # Use first frame as base
-    base_svg = prepared_frames[0]
+def _parse_frame(svg: str):
+    """Parse one prepared SVG frame."""
+    return LET.fromstring(svg.encode("utf-8"), _FRAME_PARSER)
 
-    # Parse frames with lxml which handles namespaces better
+
+def _path_bbox_from_d(d: str) -> tuple[float, float, float, float] | None:
+    if not d:
+        return None
     try:
-        from lxml import etree as LET
+        # Matplotlib separates every number, so split + float covers its
+        # output without running the regex over the whole path.
+        nums = list(map(float, d.translate(_PATH_SEPARATORS).split()))
+    except ValueError:
+        # Compact path syntax ("1-2", "1.5.5") needs the tokenizing regex.
+        nums = [float(x) for x in _NUM_RE.findall(d)]
+    if len(nums) < 4:
+        return None
+    xs = nums[0::2]
+    ys = nums[1::2]
+    if not xs or not ys:
+        return None
+    return (min(xs), min(ys), max(xs), max(ys))
 
-        use_lxml = True
-    except ImportError:
-        use_lxml = False
-        import xml.etree.ElementTree as ET
 
-    try:
-        if use_lxml:
-            # lxml handles namespaces gracefully
-            parser = LET.XMLParser(recover=True, remove_blank_text=True)
-            trees = [LET.fromstring(svg.encode("utf-8"), parser) for svg in prepared_frames]
-            base_tree = trees[0]
-        else:
-            # Fallback to ET - remove namespaces manually
-            cleaned_frames = []
-            for svg in prepared_frames:
-                # Remove xmlns declarations
-                cleaned = re.sub(r'\s+xmlns[^=]*="[^"]*"', "", svg)
-                cleaned_frames.append(cleaned)
-            trees = [ET.fromstring(svg) for svg in cleaned_frames]
-            base_tree = trees[0]
-    except Exception as e:
-        raise ValueError(f"Failed to parse SVG frames: {e}")
+def _bbox_size(bb: tuple[float, float, float, float] | None) -> tuple[float, float] | None:
+    if bb is None:
+        return None
+    x0, y0, x1, y1 = bb
+    return (max(0.0, x1 - x0), max(0.0, y1 - y0))
 
-    # Build element index for base (id -> element)
-    base_elements = {}
-    for elem in base_tree.iter():
-        # Get tag without namespace
-        if use_lxml:
-            # For lxml, need to handle QName properly
-            tag_str = str(elem.tag) if elem.tag is not None else ""
-            tag = tag_str.split("}")[-1] if "}" in tag_str else tag_str
-        else:
-            tag = elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
-
-        elem_id = elem.get("id")
-        if elem_id:
-            base_elements[elem_id] = elem
-
-    _NUM_RE = re.compile(r"[-+]?(?:\d*\.\d+|\d+)(?:[eE][-+]?\d+)?")
-
-    def _path_bbox_from_d(d: str) -> tuple[float, float, float, float] | None:
-        if not d:
-            return None
-        nums = [float(x) for x in _NUM_RE.findall(d)]
-        if len(nums) < 4:
-            return None
-        xs = nums[0::2]
-        ys = nums[1::2]
-        if not xs or not ys:
-            return None
-        return (min(xs), min(ys), max(xs), max(ys))
 
-    def _bbox_size(bb: tuple[float, float, float, float] | None) -> tuple[float, float] | None:
-        if bb is None:
-            return None
-        x0, y0, x1, y1 = bb
-        return (max(0.0, x1 - x0), max(0.0, y1 - y0))
+def _viewbox_wh(tree_root) -> tuple[float, float] | None:
+    vb = tree_root.get("viewBox")
+    if not vb:
+        return None
+    parts = vb.replace(",", " ").split()
+    if len(parts) != 4:
+        return None
+    try:
+        return (float(parts[2]), float(parts[3]))
+    except Exception:
+        return None
 
-    def _viewbox_wh(tree_root) -> tuple[float, float] | None:
-        vb = tree_root.get("viewBox")
-        if not vb:
-            return None
-        parts = vb.replace(",", " ").split()
-        if len(parts) != 4:
-            return None
-        try:
-            return (float(parts[2]), float(parts[3]))
-        except Exception:
-            return None
 
-    def _build_parent_map(root):
-        """Return a mapping child -> parent for a parsed XML tree."""
+def _index_id_elements(tree) -> List[Tuple[str, Any, str | None, str | None, bool]]:
+    """Return ``(id, elem, region, owner, in_text)`` for every element with an id.
 
-        parent_map = {}
-        for parent in root.iter():
-            for child in list(parent):
-                parent_map[child] = parent
-        return parent_map
+    ``region`` is the nearest Matplotlib major region id (``axes_*``,
+    ``legend_*``), counting the element itself. Matplotlib SVG output
+    typically has stable top-level groups like `axes_1` and `legend_1`.
+    Numeric ids under them (`path_26`, `patch_10`) are *not* stable across
+    renders when artists are inserted/removed. If the *same id* appears under
+    a different major region in another frame, id-based deltas will apply to
+    the wrong element.
 
-    def _get_parent(elem, parent_map):
-        if use_lxml:
-            try:
-                return elem.getparent()
-            except Exception:
-                return None
-        return parent_map.get(elem)
-
-    def _find_major_region(elem, parent_map) -> str | None:
-        """Return the nearest Matplotlib major region id (axes_*, legend_*).
-
-        Matplotlib SVG output typically has stable top-level groups like
-        `axes_1` and `legend_1`. Numeric ids under them (`path_26`, `patch_10`)
-        are *not* stable across renders when artists are inserted/removed.
-        If the *same id* appears under a different major region in another
-        frame, id-based deltas will apply to the wrong element.
-        """
-
-        cur = elem
-        while cur is not None:
-            cid = cur.get("id")
-            if cid and (cid.startswith("axes_") or cid.startswith("legend_")):
-                return cid
-            cur = _get_parent(cur, parent_map)
-        return None
+    ``owner`` is the nearest enclosing artist group (``line2d_*``,
+    ``patch_*``, ...), excluding the element itself. Numeric ids like
+    `path_27` can be reused between different artists even within the same
+    major region, so the owner is a more stable indicator of what the id
+    "belongs" to.
 
-    _OWNER_GROUP_ID_RE = re.compile(r"^(?:line2d|patch|text|matplotlib\.axis|xtick|ytick)_")
+    ``in_text`` is True below a Matplotlib text group (``text_*``); such
+    elements are covered by the group's outerHTML delta.
 
-    def _find_owner_group(elem, parent_map) -> str | None:
-        """Return the nearest Matplotlib artist group id for an element.
+    Everything is carried down a single depth-first walk, which is the only
+    tree traversal a frame needs.
+    """
 
-        Many Matplotlib SVG nodes have numeric ids like `path_27` that can be
-        reused between different artists even within the same major region.
-        The nearest artist group (`line2d_*`, `patch_*`, etc.) is a more stable
-        indicator of what the id "belongs" to.
-        """
+    indexed = []
+    # (region, owner, in_text) in effect for the children of each open element.
+    stack: List[Tuple[str | None, str | None, bool]] = [(None, None, False)]
+    # This loop runs for every node of every frame: bind the hot methods once.
+    push, pop, add = stack.append, stack.pop, indexed.append
+    is_owner_group = _OWNER_GROUP_ID_RE.match
+    for event, elem in LET.iterwalk(tree, events=("start", "end")):
+        if event == "end":
+            pop()
+            continue
+        region, owner, in_text = stack[-1]
+        eid = elem.get("id")
+        if eid:
+            if eid.startswith(_MAJOR_REGION_PREFIXES):
+                region = eid
+            add((eid, elem, region, owner, in_text))
+            if is_owner_group(eid):
+                owner = eid
+            if eid.startswith("text_"):
+                in_text = True
+        push((region, owner, in_text))
+    return indexed
+
+
+def _is_volatile_id(elem_id: str) -> bool:
+    """Return True for ids that are frequently regenerated by Matplotlib.
+
+    These ids often change on each render but are not meaningful for our
+    delta matching strategy (e.g. clipPath ids `p...` and marker ids `m...`).
+    """
 
-        cur = _get_parent(elem, parent_map)
-        while cur is not None:
-            cid = cur.get("id")
-            if cid and _OWNER_GROUP_ID_RE.match(cid):
-                return cid
-            cur = _get_parent(cur, parent_map)
-        return None
+    if not elem_id:
+        return True
+    return bool(_VOLATILE_ID_RE.match(elem_id))
 
-    base_parent_map = _build_parent_map(base_tree)
-    base_region_by_id: Dict[str, str | None] = {}
-    base_owner_by_id: Dict[str, str | None] = {}
-    for _id, _elem in base_elements.items():
-        base_region_by_id[_id] = _find_major_region(_elem, base_parent_map)
-        base_owner_by_id[_id] = _find_owner_group(_elem, base_parent_map)
 
-    _VOLATILE_ID_RE = re.compile(r"^(?:p|m)[0-9a-fA-F]{6,}$")
+def _snapshot(elem) -> Tuple[List[Tuple[str, str]], Dict[str, str], str]:
+    """Return ``(attribute pairs, attribute dict, stripped text)`` for ``elem``."""
+    items = elem.items()
+    return items, dict(items), (elem.text or "").strip()
 
-    def _is_volatile_id(elem_id: str) -> bool:
-        """Return True for ids that are frequently regenerated by Matplotlib.
 
-        These ids often change on each render but are not meaningful for our
-        delta matching strategy (e.g. clipPath ids `p...` and marker ids `m...`).
-        """
+def _build_base_context(base_tree) -> Dict[str, Any]:
+    """Index the base frame once; every frame is diffed against this context."""
 
-        if not elem_id:
-            return True
-        return bool(_VOLATILE_ID_RE.match(elem_id))
+    # Build element index for base (id -> element)
+    base_elements: Dict[str, Any] = {}
+    base_region_by_id: Dict[str, str | None] = {}
+    base_owner_by_id: Dict[str, str | None] = {}
+    for _id, _elem, region, owner, _in_text in _index_id_elements(base_tree):
+        base_elements[_id] = _elem
+        base_region_by_id[_id] = region
+        base_owner_by_id[_id] = owner
 
     base_legend_ids: set[str] = {
         eid
@@ -264,8 +316,6 @@ def compute_svg_deltas(svg_frames: List[str]) -> Tuple[str, List[Dict[str, Any]]
         if eid and reg is not None and reg.startswith("legend_") and not _is_volatile_id(eid)
     }
 
-    base_view_wh = _viewbox_wh(base_tree)
-
     # Identify legend background/frame paths (typically filled white) and
     # record their base bounding boxes. If these paths suddenly become huge in
     # a frame, it is a strong sign that a numeric id got reassigned.
@@ -276,7 +326,7 @@ def compute_svg_deltas(svg_frames: List[str]) -> Tuple[str, List[Dict[str, Any]]
         elem = base_elements.get(eid)
         if elem is None:
             continue
-        if (str(elem.tag).split("}")[-1] or "") != "path":
+        if _localname(elem.tag) != "path":
             continue
         style = elem.get("style") or ""
         if "fill: #ffffff" not in style:
@@ -285,195 +335,208 @@ def compute_svg_deltas(svg_frames: List[str]) -> Tuple[str, List[Dict[str, Any]]
         if bb is not None:
             base_legend_frame_bbox_by_id[eid] = bb
 
-    def _has_text_ancestor_lxml(elem) -> bool:
-        """Return True if elem is inside a Matplotlib text group (id startswith 'text_')."""
-        if not use_lxml:
-            return False
-        parent = elem.getparent()
-        while parent is not None:
-            pid = parent.get("id")
-            if pid and pid.startswith("text_"):
-                return True
-            parent = parent.getparent()
-        return False
+    return {
+        "elements": base_elements,
+        # Frozen (attribute pairs, attribute dict, text) snapshots so
+        # per-frame diffs compare against plain Python objects instead of
+        # going through lxml proxies.
+        "snapshots": {eid: _snapshot(elem) for eid, elem in base_elements.items()},
+        # Serialized markup of the base text groups; these only change when a
+        # frame's label differs, so the base side is encoded once up front.
+        "text_html": {
+            eid: LET.tostring(elem, encoding="utf-8")
+            for eid, elem in base_elements.items()
+            if eid.startswith("text_")
+        },
+        "ids": {k for k in base_elements.keys() if not _is_volatile_id(k)},
+        "region_by_id": base_region_by_id,
+        "owner_by_id": base_owner_by_id,
+        "legend_ids": base_legend_ids,
+        "legend_frame_bbox_by_id": base_legend_frame_bbox_by_id,
+        "view_wh": _viewbox_wh(base_tree),
+    }
 
-    def _is_xlink_href(attr_name: str) -> bool:
-        # lxml uses Clark notation for namespaced attrs: "{ns}local"
-        return attr_name.endswith("}href") and attr_name.startswith(
-            "{http://www.w3.org/1999/xlink}"
+
+def _frame_needs_fallback(base: Dict[str, Any], indexed) -> bool:
+    """Return True when id-based diffs against the base would be unreliable.
+
+    ``indexed`` is the frame's `_index_id_elements` result. Checks run
+    cheapest first and the first hit decides.
+    """
+
+    base_ids = base["ids"]
+
+    cur_ids = set()
+    cur_by_id: Dict[str, Any] = {}  # first element carrying each id
+    cur_regions_by_id: Dict[str, set] = {}
+    cur_owners_by_id: Dict[str, set] = {}
+    for eid, e, region, owner, _in_text in indexed:
+        cur_by_id.setdefault(eid, e)
+        if _is_volatile_id(eid):
+            continue
+        cur_ids.add(eid)
+        cur_regions_by_id.setdefault(eid, set()).add(region)
+        cur_owners_by_id.setdefault(eid, set()).add(owner)
+
+    # If there are lots of ids present in one but not the other, it is
+    # a strong signal that numeric ids (patch_*, line2d_*, etc.) have
+    # shifted due to artist insertions/removals (e.g. variable-sized
+    # repeat-generated polygons). In that case, id-based diffs will
+    # apply to the wrong elements and produce visual drift.
+    # |A ^ B| = |A| + |B| - 2|A & B|, without building A ^ B.
+    shared_ids = base_ids & cur_ids
+    sym_diff_count = len(base_ids) + len(cur_ids) - 2 * len(shared_ids)
+    diff_ratio = sym_diff_count / max(1, len(base_ids))
+
+    # Threshold tuned for Matplotlib SVG: minor differences happen,
+    # but large structural changes should fall back.
+    if diff_ratio > 0.10 or sym_diff_count > 200:
+        return True
+
+    # Legend is small relative to the full SVG, so global id-set
+    # heuristics can miss instability inside the legend. If legend
+    # ids churn, delta-by-id becomes unreliable.
+    base_legend_ids = base["legend_ids"]
+    if base_legend_ids:
+        cur_legend_ids: set[str] = {
+            eid
+            for eid, regs in cur_regions_by_id.items()
+            if eid
+            and any((r or "").startswith("legend_") for r in regs)
+            and not _is_volatile_id(eid)
+        }
+        legend_sym_diff_count = (
+            len(base_legend_ids) + len(cur_legend_ids) - 2 * len(base_legend_ids & cur_legend_ids)
         )
+        legend_diff_ratio = legend_sym_diff_count / max(1, len(base_legend_ids))
+        if legend_diff_ratio > 0.10 or legend_sym_diff_count > 25:
+            return True
 
-    # Compute deltas for each frame
-    deltas = []
+    # Detect unstable numeric-id reuse across major regions (e.g.
+    # `path_26` being a legend patch in base, but a rectangle patch
+    # under axes in another frame). This kind of mismatch can break
+    # even when the *set* of ids is similar.
+    base_region_by_id = base["region_by_id"]
+    base_owner_by_id = base["owner_by_id"]
+    for eid in shared_ids:
+        base_region = base_region_by_id.get(eid)
+        if not base_region or not base_region.startswith(_MAJOR_REGION_PREFIXES):
+            continue
+        # The id must appear exclusively under the same major region.
+        # If it moves between axes/legend groups across frames, id-based
+        # deltas apply to the wrong element and can make parts disappear.
+        if cur_regions_by_id.get(eid, set()) != {base_region}:
+            return True
 
-    for frame_idx, tree in enumerate(trees):
-        # Optional fallback: store the full SVG for frames whose structure does
-        # not match the base frame well enough for id-based diffs.
-        frame_delta: Dict[str, Any] = {"frame": frame_idx, "changes": {}}
+        # Even when the major region stays the same, Matplotlib can
+        # reassign numeric ids (e.g. `path_27`) between different
+        # artist groups such as `line2d_*` and `patch_*`. This is a
+        # strong signal that id-based deltas will drift.
+        base_owner = base_owner_by_id.get(eid)
+        if base_owner and cur_owners_by_id.get(eid, set()) != {base_owner}:
+            return True
 
-        if frame_idx != 0:
-            try:
-                base_ids = {k for k in base_elements.keys() if not _is_volatile_id(k)}
-                cur_ids = set()
-                cur_parent_map = _build_parent_map(tree)
-                cur_regions_by_id: Dict[str, set] = {}
-                cur_owners_by_id: Dict[str, set] = {}
-                for e in tree.iter():
-                    eid = e.get("id")
-                    if not eid or _is_volatile_id(eid):
-                        continue
-                    cur_ids.add(eid)
-                    cur_regions_by_id.setdefault(eid, set()).add(
-                        _find_major_region(e, cur_parent_map)
-                    )
-                    cur_owners_by_id.setdefault(eid, set()).add(
-                        _find_owner_group(e, cur_parent_map)
-                    )
-
-                # Detect unstable numeric-id reuse across major regions (e.g.
-                # `path_26` being a legend patch in base, but a rectangle patch
-                # under axes in another frame). This kind of mismatch can break
-                # even when the *set* of ids is similar.
-                major_region_conflict = False
-
-                # Geometry-based safeguard for legend frame: if the legend frame
-                # path becomes dramatically larger than in base (or spans most
-                # of the figure), it likely means the id got reassigned.
-                if base_legend_frame_bbox_by_id:
-                    for eid, base_bb in base_legend_frame_bbox_by_id.items():
-                        cur_bb = None
-                        for e in tree.iter():
-                            if e.get("id") == eid:
-                                cur_bb = _path_bbox_from_d(e.get("d") or "")
-                                break
-                        base_sz = _bbox_size(base_bb)
-                        cur_sz = _bbox_size(cur_bb)
-                        if not base_sz or not cur_sz:
-                            continue
-                        base_w, base_h = base_sz
-                        cur_w, cur_h = cur_sz
-                        if base_w <= 0.01 or base_h <= 0.01:
-                            major_region_conflict = True
-                            break
-                        if cur_w > base_w * 3.0 or cur_h > base_h * 3.0:
-                            major_region_conflict = True
-                            break
-                        if base_view_wh is not None:
-                            vw, vh = base_view_wh
-                            if vw > 0 and vh > 0 and (cur_w > 0.8 * vw or cur_h > 0.8 * vh):
-                                major_region_conflict = True
-                                break
-
-                # Legend is small relative to the full SVG, so global id-set
-                # heuristics can miss instability inside the legend. If legend
-                # ids churn, delta-by-id becomes unreliable.
-                if base_legend_ids:
-                    cur_legend_ids: set[str] = {
-                        eid
-                        for eid, regs in cur_regions_by_id.items()
-                        if eid
-                        and any((r or "").startswith("legend_") for r in regs)
-                        and not _is_volatile_id(eid)
-                    }
-                    legend_sym_diff = base_legend_ids.symmetric_difference(cur_legend_ids)
-                    legend_denom = max(1, len(base_legend_ids))
-                    legend_diff_ratio = len(legend_sym_diff) / legend_denom
-                    if legend_diff_ratio > 0.10 or len(legend_sym_diff) > 25:
-                        major_region_conflict = True
-
-                for eid in base_ids & cur_ids:
-                    base_region = base_region_by_id.get(eid)
-                    if not base_region or not (
-                        base_region.startswith("axes_") or base_region.startswith("legend_")
-                    ):
-                        continue
-                    cur_regions = cur_regions_by_id.get(eid, set())
-                    # The id must appear exclusively under the same major region.
-                    # If it moves between axes/legend groups across frames, id-based
-                    # deltas apply to the wrong element and can make parts disappear.
-                    if cur_regions != {base_region}:
-                        major_region_conflict = True
-                        break
-
-                    # Even when the major region stays the same, Matplotlib can
-                    # reassign numeric ids (e.g. `path_27`) between different
-                    # artist groups such as `line2d_*` and `patch_*`. This is a
-                    # strong signal that id-based deltas will drift.
-                    base_owner = base_owner_by_id.get(eid)
-                    if base_owner:
-                        cur_owners = cur_owners_by_id.get(eid, set())
-                        if cur_owners != {base_owner}:
-                            major_region_conflict = True
-                            break
-
-                if major_region_conflict:
-                    frame_delta = {"frame": frame_idx, "fullSvg": prepared_frames[frame_idx]}
-                    deltas.append(frame_delta)
-                    continue
+    # Geometry-based safeguard for legend frame: if the legend frame
+    # path becomes dramatically larger than in base (or spans most
+    # of the figure), it likely means the id got reassigned.
+    base_view_wh = base["view_wh"]
+    for eid, base_bb in base["legend_frame_bbox_by_id"].items():
+        cur_elem = cur_by_id.get(eid)
+        cur_bb = _path_bbox_from_d(cur_elem.get("d") or "") if cur_elem is not None else None
+        base_sz = _bbox_size(base_bb)
+        cur_sz = _bbox_size(cur_bb)
+        if not base_sz or not cur_sz:
+            continue
+        base_w, base_h = base_sz
+        cur_w, cur_h = cur_sz
+        if base_w <= 0.01 or base_h <= 0.01:
+            return True
+        if cur_w > base_w * 3.0 or cur_h > base_h * 3.0:
+            return True
+        if base_view_wh is not None:
+            vw, vh = base_view_wh
+            if vw > 0 and vh > 0 and (cur_w > 0.8 * vw or cur_h > 0.8 * vh):
+                return True
 
-                # If there are lots of ids present in one but not the other, it is
-                # a strong signal that numeric ids (patch_*, line2d_*, etc.) have
-                # shifted due to artist insertions/removals (e.g. variable-sized
-                # repeat-generated polygons). In that case, id-based diffs will
-                # apply to the wrong elements and produce visual drift.
-                sym_diff = base_ids.symmetric_difference(cur_ids)
-                denom = max(1, len(base_ids))
-                diff_ratio = len(sym_diff) / denom
-
-                # Threshold tuned for Matplotlib SVG: minor differences happen,
-                # but large structural changes should fall back.
-                if diff_ratio > 0.10 or len(sym_diff) > 200:
-                    frame_delta = {"frame": frame_idx, "fullSvg": prepared_frames[frame_idx]}
-                    deltas.append(frame_delta)
-                    continue
-            except Exception:
-                # If anything goes wrong, proceed with normal diffing.
-                pass
+    return False
 
-        # Find all elements with IDs in current frame
-        for elem in tree.iter():
-            elem_id = elem.get("id")
-            if not elem_id:
-                continue
 
-            # Robust text handling: Matplotlib often represents text as a group
-            # (`<g id="text_...">`) containing a variable number of glyph nodes.
-            # When text length changes, the internal structure changes, making
-            # per-glyph deltas brittle. Instead, for the top-level text group we
-            # replace the whole subtree via `outerHTML`.
-            if use_lxml and elem_id.startswith("text_"):
-                base_elem = base_elements.get(elem_id)
-                if base_elem is None:
-                    continue
-                try:
-                    cur_html = LET.tostring(elem, encoding="unicode")
-                    base_html = LET.tostring(base_elem, encoding="unicode")
-                except Exception:
-                    cur_html = None
-                    base_html = None
-
-                if cur_html is not None and cur_html != base_html:
-                    frame_delta["changes"][elem_id] = {"outerHTML": cur_html}
-                continue
+def _diff_frame(base: Dict[str, Any], frame_idx: int, tree, frame_svg: str) -> Dict[str, Any]:
+    """Compute the delta of one parsed frame against the base context."""
 
-            # If this element is under a text group, skip it.
-            if use_lxml and _has_text_ancestor_lxml(elem):
-                continue
+    base_text_html = base["text_html"]
+    base_snapshots = base["snapshots"]
+    base_legend_frame_bbox_by_id = base["legend_frame_bbox_by_id"]
+
+    # Optional fallback: store the full SVG for frames whose structure does
+    # not match the base frame well enough for id-based diffs.
+    frame_delta: Dict[str, Any] = {"frame": frame_idx, "changes": {}}
+
+    # One walk feeds the conflict checks and the diff loop below.
+    indexed = _index_id_elements(tree)
 
-            base_elem = base_elements.get(elem_id)
-            if base_elem is None:
+    if frame_idx != 0:
+        try:
+            needs_fallback = _frame_needs_fallback(base, indexed)
+        except Exception:
+            # If anything goes wrong, proceed with normal diffing.
+            needs_fallback = False
+        if needs_fallback:
+            return {"frame": frame_idx, "fullSvg": frame_svg}
+
+    # Ids of elements inside a text group; those are covered by the
+    # group's outerHTML replacement below.
+    text_descendant_ids = {eid for eid, _e, _r, _o, in_text in indexed if in_text}
+
+    # Find all elements with IDs in current frame
+    for elem_id, elem, _region, _owner, _in_text in indexed:
+
+        # Robust text handling: Matplotlib often represents text as a group
+        # (`<g id="text_...">`) containing a variable number of glyph nodes.
+        # When text length changes, the internal structure changes, making
+        # per-glyph deltas brittle. Instead, for the top-level text group we
+        # replace the whole subtree via `outerHTML`.
+        if elem_id.startswith("text_"):
+            base_html = base_text_html.get(elem_id)
+            if base_html is None:
                 continue
+            # Compare UTF-8 bytes and decode only the markup that is stored.
+            try:
+                cur_html = LET.tostring(elem, encoding="utf-8")
+            except Exception:
+                cur_html = None
 
-            # Compare attributes
-            changes = {}
+            if cur_html is not None and cur_html != base_html:
+                frame_delta["changes"][sys.intern(elem_id)] = {
+                    "outerHTML": cur_html.decode("utf-8")
+                }
+            continue
 
-            # Check all attributes in current element
-            for attr, value in elem.attrib.items():
-                if attr == "id":
-                    continue
-                # Ignore noisy internal-reference attributes that often change
-                # due to non-deterministic Matplotlib ids (notably clipPath ids).
-                if attr in ("clip-path",):
+        # If this element is under a text group, skip it.
+        if elem_id in text_descendant_ids:
+            continue
+
+        snapshot = base_snapshots.get(elem_id)
+        if snapshot is None:
+            continue
+        base_items, base_attrs, base_text = snapshot
+
+        # Compare attributes. Most elements are unchanged between frames and
+        # Matplotlib writes attributes in a fixed order, so comparing the
+        # (name, value) lists settles them before a dict is even built; the
+        # dict comparison then absorbs pure reorderings. elem.items() builds
+        # the pairs in C, skipping the .attrib proxy.
+        changes = []  # (key, value) pairs; a dict is built only if any exist
+        # Emitted ids and attribute names are interned, so the deltas of all
+        # frames share one copy of each key string.
+        cur_items = elem.items()
+
+        if cur_items != base_items and (cur_attrs := dict(cur_items)) != base_attrs:
+            # Attributes that differ from (or are missing in) the base.
+            for attr, value in cur_attrs.items():
+                # `id` is the match key; clip-path references often change
+                # due to non-deterministic Matplotlib ids (clipPath ids).
+                if attr in _IGNORED_DIFF_ATTRS or base_attrs.get(attr) == value:
                     continue
 
                 # Matplotlib often regenerates marker <defs> ids on each render,
@@ -481,77 +544,233 @@ def compute_svg_deltas(svg_frames: List[str]) -> Tuple[str, List[Dict[str, Any]]
                 # Those references point to ids that do NOT exist in our base.svg
                 # (since we only keep base defs), so applying them makes markers
                 # (including point primitives) disappear.
-                if _is_xlink_href(attr) and isinstance(value, str) and value.startswith("#m"):
-                    base_value = base_elem.get(attr)
-                    if isinstance(base_value, str) and base_value.startswith("#m"):
+                if attr == _XLINK_HREF and value[:2] == "#m":
+                    base_value = base_attrs.get(attr)
+                    if base_value is not None and base_value[:2] == "#m":
                         continue
 
-                base_value = base_elem.get(attr)
-                if value != base_value:
-                    changes[attr] = value
+                changes.append((sys.intern(attr), value))
+
+            # Attributes removed relative to the base. A base marker reference
+            # only counts as removed when the attribute is gone entirely.
+            removed = base_attrs.keys() - cur_attrs.keys() - _IGNORED_DIFF_ATTRS
+            if removed:
+                for attr in base_attrs:
+                    if attr in removed:
+                        changes.append((sys.intern(attr), None))
+
+        # Compare text content
+        elem_text = (elem.text or "").strip()
+        if elem_text != base_text:
+            changes.append(("textContent", elem_text))
+
+        # NOTE: we intentionally do NOT include tail text changes.
+        # The runtime JS skips tailContent (non-visual in our SVGs).
+
+        # If there are changes, add to delta
+        if changes:
+            frame_delta["changes"][sys.intern(elem_id)] = dict(changes)
+
+    # Post-diff sanity check: the legend background box (typically a white
+    # filled path under legend_*) should not suddenly become an unfilled
+    # line/shape via id-based changes. When that happens it usually means a
+    # numeric id (e.g. `path_26`) got reassigned to a different artist.
+    if frame_idx != 0 and "changes" in frame_delta and base_legend_frame_bbox_by_id:
+        for eid in base_legend_frame_bbox_by_id.keys():
+            ch = frame_delta.get("changes", {}).get(eid)
+            if not isinstance(ch, dict):
+                continue
+            style_val = ch.get("style")
+            if isinstance(style_val, str) and "fill: #ffffff" not in style_val:
+                frame_delta = {"frame": frame_idx, "fullSvg": frame_svg}
+                break
 
-            # Check for removed attributes
-            for attr in base_elem.attrib:
-                if attr == "id":
-                    continue
-                if attr in ("clip-path",):
-                    continue
-                if _is_xlink_href(attr):
-                    base_value = base_elem.get(attr)
-                    cur_value = elem.get(attr)
-                    if (
-                        isinstance(base_value, str)
-                        and base_value.startswith("#m")
-                        and isinstance(cur_value, str)
-                    ):
-                        # Keep the base marker reference even if Matplotlib drops/changes it.
-                        continue
-                if attr not in elem.attrib:
-                    changes[attr] = None
-
-            # Compare text content
-            elem_text = (elem.text or "").strip()
-            base_text = (base_elem.text or "").strip()
-            if elem_text != base_text:
-                changes["textContent"] = elem_text
-
-            # NOTE: we intentionally do NOT include tail text changes.
-            # The runtime JS skips tailContent (non-visual in our SVGs).
-
-            # If there are changes, add to delta
-            if changes:
-                frame_delta["changes"][elem_id] = changes
-
-        # Post-diff sanity check: the legend background box (typically a white
-        # filled path under legend_*) should not suddenly become an unfilled
-        # line/shape via id-based changes. When that happens it usually means a
-        # numeric id (e.g. `path_26`) got reassigned to a different artist.
-        if frame_idx != 0 and "changes" in frame_delta and base_legend_frame_bbox_by_id:
-            for eid in base_legend_frame_bbox_by_id.keys():
-                ch = frame_delta.get("changes", {}).get(eid)
-                if not isinstance(ch, dict):
-                    continue
-                style_val = ch.get("style")
-                if isinstance(style_val, str) and "fill: #ffffff" not in style_val:
-                    frame_delta = {"frame": frame_idx, "fullSvg": prepared_frames[frame_idx]}
-                    break
+    return frame_delta
 
-        deltas.append(frame_delta)
+
+def _init_delta_worker(base_svg: str) -> None:
+    """Process-pool initializer: parse and index the base frame once per worker."""
+    global _WORKER_BASE_CONTEXT
+    _WORKER_BASE_CONTEXT = _build_base_context(_parse_frame(base_svg))
+
+
+def _diff_frame_in_worker(frame_idx: int, frame_svg: str) -> Dict[str, Any]:
+    """Parse and diff one frame against the worker's base context."""
+    try:
+        tree = _parse_frame(frame_svg)
+    except Exception as e:
+        raise ValueError(f"Failed to parse SVG frames: {e}")
+    return _diff_frame(_WORKER_BASE_CONTEXT, frame_idx, tree, frame_svg)
+
+
+def _diff_frames_parallel(
+    base_svg: str,
+    frame_indices: List[int],
+    frame_svgs: List[str],
+    workers: int,
+    mp_context: Any = None,
+) -> List[Dict[str, Any]] | None:
+    """Diff frames in worker processes; return None if no pool is available."""
+    workers = min(workers, len(frame_svgs))
+    if workers < 2:
+        return None
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=mp_context,
+            initializer=_init_delta_worker,
+            initargs=(base_svg,),
+        ) as executor:
+            chunksize = max(1, len(frame_svgs) // (4 * workers))
+            return list(
+                executor.map(
+                    _diff_frame_in_worker,
+                    frame_indices,
+                    frame_svgs,
+                    chunksize=chunksize,
+                )
+            )
+    except ValueError:
+        raise
+    except Exception:
+        # Process pools are unavailable in some environments (e.g. inside
+        # daemonic Sphinx workers or sandboxes); diff sequentially instead.
+        return None
+
+
+def compute_svg_deltas(
+    svg_frames: List[str], workers: int = 1, mp_context: Any = None
+) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Compute deltas between SVG frames.
+
+    Args:
+        svg_frames: List of SVG strings (one per frame)
+        workers: Worker processes to diff frames with; ``1`` diffs serially
+        mp_context: Multiprocessing context for the worker pool (platform default if None)
+
+    Returns:
+        Tuple of (base_svg, deltas) where:
+        - base_svg: First frame with all elements
+        - deltas: List of frame-specific changes
+    """
+    if not svg_frames:
+        raise ValueError("Need at least one frame")
+
+    # Prepare SVGs so deltas become meaningful: remove metadata noise and add
+    # deterministic ids for anonymous elements.
+    prepared = [_prepare_frame(s) for s in svg_frames]
+    prepared_frames = [svg for svg, _root in prepared]
+
+    # Use first frame as base
+    base_svg, base_root = prepared[0]
+
+    try:
+        base_tree = base_root if base_root is not None else _parse_frame(base_svg)
+    except Exception as e:
+        raise ValueError(f"Failed to parse SVG frames: {e}")
+
+    # Byte-identical prepared frames (a slider step that leaves the figure
+    # unchanged, or one that revisits an earlier state) always produce the
+    # same delta, so only the first occurrence of each is parsed and diffed.
+    # The prepared string is its own key: str caches its hash and equal
+    # strings compare with a memcmp, so no separate digest is needed.
+    first_index_by_svg: Dict[str, int] = {}
+    for frame_idx, svg in enumerate(prepared_frames):
+        first_index_by_svg.setdefault(svg, frame_idx)
+    unique_indices = list(first_index_by_svg.values())
+
+    unique_deltas = None
+    if workers > 1 and len(unique_indices) >= _PARALLEL_MIN_FRAMES:
+        unique_deltas = _diff_frames_parallel(
+            base_svg,
+            unique_indices,
+            [prepared_frames[i] for i in unique_indices],
+            workers,
+            mp_context,
+        )
+
+    if unique_deltas is None:
+        base = _build_base_context(base_tree)
+        unique_deltas = []
+        for frame_idx in unique_indices:
+            svg, root = prepared[frame_idx]
+            # Trees left over from preparing a frame are reused rather than re-parsed.
+            if frame_idx == 0:
+                tree = base_tree
+            elif root is not None:
+                tree = root
+            else:
+                try:
+                    tree = _parse_frame(svg)
+                except Exception as e:
+                    raise ValueError(f"Failed to parse SVG frames: {e}")
+            unique_deltas.append(_diff_frame(base, frame_idx, tree, svg))
+
+    delta_by_svg = dict(zip(first_index_by_svg, unique_deltas))
+    deltas = []
+    for frame_idx, svg in enumerate(prepared_frames):
+        delta = delta_by_svg[svg]
+        if delta["frame"] != frame_idx:
+            delta = _renumber_delta(delta, frame_idx)
+        deltas.append(delta)
 
     return base_svg, deltas
 
 
-def save_delta_format(base_svg: str, deltas: List[Dict[str, Any]], output_dir: str) -> None:
+def _renumber_delta(delta: Dict[str, Any], frame_idx: int) -> Dict[str, Any]:
+    """Copy a delta computed for an identical frame under a new frame index."""
+    copied = dict(delta, frame=frame_idx)
+    if "changes" in delta:
+        copied["changes"] = {eid: dict(ch) for eid, ch in delta["changes"].items()}
+    return copied
+
+
+def _dumps_compact(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _write_precompressed(path: str) -> None:
+    """Write ``<path>.gz`` (and ``<path>.br`` when brotli is installed) next to ``path``.
+
+    Servers set up for precompressed assets (nginx ``gzip_static`` /
+    ``brotli_static``, most CDNs) pick these up with the right
+    ``Content-Encoding``; the page keeps requesting the plain URL, so hosts
+    that ignore them are unaffected.
+    """
+    # mtime=0 keeps the .gz bytes identical across rebuilds.
+    with open(path, "rb") as src, open(path + ".gz", "wb") as raw:
+        with gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=9, mtime=0) as gz:
+            shutil.copyfileobj(src, gz)
+
+    br_path = path + ".br"
+    if brotli is None:
+        # Never leave a sidecar from an earlier build that no longer matches.
+        if os.path.exists(br_path):
+            os.remove(br_path)
+        return
+    compressor = brotli.Compressor(quality=11)
+    with open(path, "rb") as src, open(br_path, "wb") as dst:
+        for chunk in iter(lambda: src.read(1 << 20), b""):
+            dst.write(compressor.process(chunk))
+        dst.write(compressor.finish())
+
+
+def save_delta_format(base_svg: str, deltas: Iterable[Dict[str, Any]], output_dir: str) -> None:
     """
     Save delta format to disk.
 
     Args:
         base_svg: Base SVG string
-        deltas: List of delta objects
+        deltas: Delta objects in frame order (any iterable; written one by one)
         output_dir: Directory to save files
-    """
-    import os
 
+    ``base.svg`` and ``deltas.json`` also get precompressed ``.gz``/``.br``
+    sidecars (see `_write_precompressed`).
+    """
     os.makedirs(output_dir, exist_ok=True)
 
     # Save base SVG
@@ -559,18 +778,57 @@ def save_delta_format(base_svg: str, deltas: List[Dict[str, Any]], output_dir: s
     with open(base_path, "w", encoding="utf-8") as f:
         f.write(base_svg)
 
-    # Save deltas as JSON
+    # Save deltas as a compact JSON array, encoding one frame at a time so
+    # the whole document never has to exist in memory as a single string.
+    frame_count = 0
     deltas_path = os.path.join(output_dir, "deltas.json")
-    with open(deltas_path, "w", encoding="utf-8") as f:
-        json.dump(deltas, f, separators=(",", ":"))  # Compact JSON
+    # Each frame goes on its own line so the runtimes can decode frames while
+    # the file is still downloading.
+    with open(deltas_path, "wb") as f:
+        f.write(b"[")
+        for delta in deltas:
+            f.write(b",\n" if frame_count else b"\n")
+            f.write(_dumps_compact(delta))
+            frame_count += 1
+        f.write(b"\n]")
+
+    _write_precompressed(base_path)
+    _write_precompressed(deltas_path)
 
     # Save metadata
-    metadata = {"frame_count": len(deltas), "format_version": "1.0", "compression": "delta"}
+    metadata = {"frame_count": frame_count, "format_version": "1.0", "compression": "delta"}
     meta_path = os.path.join(output_dir, "metadata.json")
     with open(meta_path, "w", encoding="utf-8") as f:
         json.dump(metadata, f, indent=2)
 
 
+def read_inline_base_svg(path: str) -> str | None:
+    """Return the base SVG at ``path`` if it is small enough to embed in the page."""
+    try:
+        if os.path.getsize(path) > _INLINE_BASE_SVG_MAX_BYTES:
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _inline_base_svg_block(unique_id: str, base_svg: str | None) -> str:
+    """Embed ``base_svg`` as an inert script block the runtimes parse instead of fetching.
+
+    Returns an empty string (fetch ``base.svg`` as before) when there is no
+    markup or it contains sequences that would end the script block early.
+    """
+    if not base_svg:
+        return ""
+    # "</script" would close the block; "<script" after one of Matplotlib's
+    # "<!--" comments would keep the real closing tag from ending it.
+    lowered = base_svg.lower()
+    if "<script" in lowered or "</script" in lowered:
+        return ""
+    return f'<script type="image/svg+xml" id="base-svg-{unique_id}">{base_svg}</script>'
+
+
 def generate_delta_html(
     base_svg_url: str,
     deltas_json_url: str,
@@ -580,6 +838,7 @@ def generate_delta_html(
     initial_idx: int = 0,
     wrapper_style: str = "",
     height: str = "auto",
+    base_svg: str | None = None,
 ) -> str:
     """
     Generate HTML for delta-based interactive graph.
@@ -593,6 +852,8 @@ def generate_delta_html(
         initial_idx: Initial frame index
         wrapper_style: CSS style for wrapper div (alignment, width)
         height: Height CSS value for SVG
+        base_svg: Base SVG markup to embed in the page instead of fetching
+            ``base_svg_url`` (see `read_inline_base_svg`)
 
     Returns:
         HTML string with delta application JavaScript
@@ -600,13 +861,16 @@ def generate_delta_html(
     var_min = var_values[0]
     var_max = var_values[-1]
     initial_value = var_values[initial_idx]
-    values_js = "[" + ",".join(f"{v:.10f}" for v in var_values) + "]"
+    # Ship the slider values as one little-endian float64 blob rather than
+    # formatting each value into a JS array literal.
+    values_b64 = base64.b64encode(np.asarray(var_values, dtype="<f8").tobytes()).decode("ascii")
+    inline_base_svg = _inline_base_svg_block(unique_id, base_svg)
 
     return f"""
 <div class="interactive-graph-wrapper" style="{wrapper_style}">
     <div class="interactive-graph-container" style="display: inline-block; width: 100%;">
         <div class="interactive-graph-display" style="text-align: center;">
-            <div id="svg-container-{unique_id}" class="adaptive-figure" style="width: 100%; display: block;"></div>
+            <div id="svg-container-{unique_id}" class="adaptive-figure" style="width: 100%; display: block;"></div>{inline_base_svg}
         </div>
         <div class="interactive-graph-controls" style="padding: 8px 0; text-align: center;">
             <div style="display: flex; align-items: center; gap: 10px; max-width: 600px; margin: 0 auto;">
@@ -654,7 +918,9 @@ def generate_delta_html(
     const uniqueId = '{unique_id}';
     const baseSvgUrl = '{base_svg_url}';
     const deltasJsonUrl = '{deltas_json_url}';
-    const values = {values_js};
+    const values = new Float64Array(
+        Uint8Array.from(atob('{values_b64}'), c => c.charCodeAt(0)).buffer
+    );
     const varName = '{var_name}';
     
     const container = document.getElementById('svg-container-' + uniqueId);
@@ -668,17 +934,19 @@ def generate_delta_html(
         return;
     }}
 
+    // Built once per graph; latexForVarName only does a property lookup.
+    const greekLatex = {{
+        alpha: '\\\\alpha', beta: '\\\\beta', gamma: '\\\\gamma', delta: '\\\\delta',
+        epsilon: '\\\\epsilon', zeta: '\\\\zeta', eta: '\\\\eta', theta: '\\\\theta',
+        iota: '\\\\iota', kappa: '\\\\kappa', lambda: '\\\\lambda', mu: '\\\\mu',
+        nu: '\\\\nu', xi: '\\\\xi', pi: '\\\\pi', rho: '\\\\rho', sigma: '\\\\sigma',
+        tau: '\\\\tau', upsilon: '\\\\upsilon', phi: '\\\\phi', chi: '\\\\chi',
+        psi: '\\\\psi', omega: '\\\\omega',
+        varphi: '\\\\varphi', vartheta: '\\\\vartheta'
+    }};
+
     function latexForVarName(name) {{
-        const greek = {{
-            alpha: '\\\\alpha', beta: '\\\\beta', gamma: '\\\\gamma', delta: '\\\\delta',
-            epsilon: '\\\\epsilon', zeta: '\\\\zeta', eta: '\\\\eta', theta: '\\\\theta',
-            iota: '\\\\iota', kappa: '\\\\kappa', lambda: '\\\\lambda', mu: '\\\\mu',
-            nu: '\\\\nu', xi: '\\\\xi', pi: '\\\\pi', rho: '\\\\rho', sigma: '\\\\sigma',
-            tau: '\\\\tau', upsilon: '\\\\upsilon', phi: '\\\\phi', chi: '\\\\chi',
-            psi: '\\\\psi', omega: '\\\\omega',
-            varphi: '\\\\varphi', vartheta: '\\\\vartheta'
-        }};
-        if (greek[name]) return greek[name];
+        if (greekLatex[name]) return greekLatex[name];
         if (name.includes('_') || /\\d/.test(name)) return name;
         if (/^[A-Za-z]$/.test(name)) return name;
         return name;
@@ -706,14 +974,33 @@ def generate_delta_html(
     let svgDoc = null;
     let baseSvgTemplate = null;
     let deltas = null;
-    let svgElements = {{}};  // Cache of ID -> element
+    // Id-keyed caches have no prototype, so ids such as "constructor" or
+    // "__proto__" cannot collide with inherited properties.
+    let svgElements = Object.create(null);  // Cache of ID -> element
     let pendingFrame = null;
 
     // Safari performance: keep one mounted SVG and revert only the elements
     // changed by the previous frame, instead of re-mounting the full SVG.
     let lastFrameIndex = null;
-    let baseElementsById = {{}};   // ID -> element in baseSvgTemplate
-    let baseOuterHtmlById = {{}};  // ID -> base outerHTML string
+    let baseElementsById = Object.create(null);   // ID -> element in baseSvgTemplate
+    let baseOuterHtmlById = Object.create(null);  // ID -> base outerHTML string | null, filled on demand
+    const revertPlans = new Map();  // frame index -> resolved revert steps | null
+    const applyPlans = new Map();  // frame index -> flattened apply steps
+
+    const domParser = new DOMParser();
+    const fragmentCache = new Map();  // outerHTML string -> imported node (never mounted)
+
+    function mountSvg(svg) {{
+        // Swap the displayed SVG in one DOM mutation rather than clearing the
+        // container through innerHTML and appending afterwards.
+        if (typeof container.replaceChildren === 'function') {{
+            container.replaceChildren(svg);
+        }} else {{
+            container.innerHTML = '';
+            container.appendChild(svg);
+        }}
+        svgDoc = svg;
+    }}
 
     function styleSvg(svg) {{
         if (!svg) return;
@@ -748,28 +1035,27 @@ def generate_delta_html(
         svg.classList.add('adaptive-figure');
     }}
     
-    // Load base SVG and deltas
-    Promise.all([
-        fetch(baseSvgUrl).then(r => {{
+    // Load base SVG and deltas. A small base SVG is embedded in the page.
+    // Each resource is processed as soon as it arrives, so the base SVG is
+    // parsed while deltas.json is still downloading.
+    const inlineBaseSvg = document.getElementById('base-svg-' + uniqueId);
+    const baseSvgPromise = (
+        inlineBaseSvg ? Promise.resolve(inlineBaseSvg.textContent) : fetch(baseSvgUrl).then(r => {{
             if (!r.ok) throw new Error('Failed to load base SVG: ' + r.status + ' ' + r.statusText);
             return r.text();
-        }}),
-        fetch(deltasJsonUrl).then(r => {{
-            if (!r.ok) throw new Error('Failed to load deltas JSON: ' + r.status + ' ' + r.statusText);
-            return r.json();
         }})
-    ]).then(([svgText, deltasData]) => {{
-        
+    ).then(svgText => {{
         // Remove XML declaration, DOCTYPE, and metadata with undeclared namespaces
-        svgText = svgText.replace(/<\\?xml[^?]*\\?>/g, '');
-        svgText = svgText.replace(/<!DOCTYPE[^>]*>/g, '');
-        svgText = svgText.replace(/<metadata>[\\s\\S]*?<\\/metadata>/g, '');
+        // in one pass; metadata must go before parsing, since its prefixes
+        // would make the XML parse fail.
+        svgText = svgText.replace(
+            /<\\?xml[^?]*\\?>|<!DOCTYPE[^>]*>|<metadata>[\\s\\S]*?<\\/metadata>/g, ''
+        );
         
         // Parse as SVG XML to ensure correct namespaces/paint behavior.
         // (Parsing as text/html can turn the SVG into plain HTML elements,
         // especially if serialization introduces prefixed tags like ns0:svg.)
-        const parser = new DOMParser();
-        const doc = parser.parseFromString(svgText, 'image/svg+xml');
+        const doc = domParser.parseFromString(svgText, 'image/svg+xml');
 
         const parserError = doc.querySelector('parsererror');
         if (parserError) {{
@@ -782,11 +1068,17 @@ def generate_delta_html(
         }}
 
         // Import the SVG into the current document
-        const importedSvg = document.importNode(svgElement, true);
+        return document.importNode(svgElement, true);
+    }});
 
-        container.innerHTML = '';
-        container.appendChild(importedSvg);
-        svgDoc = importedSvg;
+    Promise.all([
+        baseSvgPromise,
+        fetch(deltasJsonUrl).then(r => {{
+            if (!r.ok) throw new Error('Failed to load deltas JSON: ' + r.status + ' ' + r.statusText);
+            return readDeltas(r);
+        }})
+    ]).then(([importedSvg, deltasData]) => {{
+        mountSvg(importedSvg);
         deltas = deltasData;
 
         if (!svgDoc) {{
@@ -824,9 +1116,15 @@ def generate_delta_html(
         container.innerHTML = '<p style="color: red; padding: 20px;">Failed to load interactive graph: ' + err.message + '</p>';
     }});
     
+    function isEmptyCache(cache) {{
+        // Stops at the first id; Object.keys would copy every id on each render.
+        for (const id in cache) return false;
+        return true;
+    }}
+
     function buildElementCache() {{
         if (!svgDoc) return;
-        svgElements = {{}};
+        svgElements = Object.create(null);
         svgDoc.querySelectorAll('[id]').forEach(elem => {{
             svgElements[elem.id] = elem;
         }});
@@ -834,19 +1132,30 @@ def generate_delta_html(
 
     function buildBaseCache() {{
         if (!baseSvgTemplate) return;
-        baseElementsById = {{}};
-        baseOuterHtmlById = {{}};
+        baseElementsById = Object.create(null);
+        baseOuterHtmlById = Object.create(null);
+        revertPlans.clear();
         baseSvgTemplate.querySelectorAll('[id]').forEach(elem => {{
             baseElementsById[elem.id] = elem;
+        }});
+    }}
+
+    function baseOuterHtmlFor(elemId) {{
+        // Serialized on first use: only outerHTML reverts (text groups) need
+        // it, and serializing every nested id'd element up front is quadratic.
+        let html = baseOuterHtmlById[elemId];
+        if (html === undefined) {{
             try {{
-                baseOuterHtmlById[elem.id] = elem.outerHTML;
+                html = baseElementsById[elemId].outerHTML || null;
             }} catch (e) {{
-                // ignore
+                html = null;
             }}
-        }});
+            baseOuterHtmlById[elemId] = html;
+        }}
+        return html;
     }}
 
-    function parseNamespacedAttrForRevert(attr) {{
+    function decodeNamespacedAttr(attr) {{
         // Matches the encoding produced by Python-side delta generation.
         if (!attr || attr.length < 3) return null;
 
@@ -876,17 +1185,108 @@ def generate_delta_html(
         return {{ ns, local }};
     }}
 
-    function replaceWithOuterHtmlForRevert(existingElem, outerHtml) {{
+    const namespacedAttrCache = new Map();  // attribute key -> {{ ns, local }} | null
+
+    function parseNamespacedAttr(attr) {{
+        // Only a handful of distinct keys ever occur (essentially xlink:href),
+        // so decode each once and answer repeats with a single lookup.
+        let parsed = namespacedAttrCache.get(attr);
+        if (parsed === undefined) {{
+            parsed = decodeNamespacedAttr(attr);
+            namespacedAttrCache.set(attr, parsed);
+        }}
+        return parsed;
+    }}
+
+    function readDeltas(response) {{
+        // deltas.json holds one frame per line (see save_delta_format), so
+        // frames are decoded while the body is still arriving instead of in
+        // one JSON.parse of the whole array once the download has finished.
+        if (!response.body || typeof response.body.getReader !== 'function' || typeof TextDecoder !== 'function') {{
+            return response.json();
+        }}
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        const frames = [];
+        let pending = '';
+
+        function takeLine(line) {{
+            if (line.charCodeAt(0) === 123) {{  // '{{': one frame, maybe followed by ','
+                frames.push(JSON.parse(line.charCodeAt(line.length - 1) === 44 ? line.slice(0, -1) : line));
+            }} else if (line.length > 1 && line.charCodeAt(0) === 91) {{  // single-line array
+                for (const frame of JSON.parse(line)) frames.push(frame);
+            }}
+            // Otherwise a bare '[' or ']' delimiter line.
+        }}
+
+        function pump() {{
+            return reader.read().then(({{ done, value }}) => {{
+                if (done) {{
+                    takeLine(pending + decoder.decode());
+                    return frames;
+                }}
+                const lines = (pending + decoder.decode(value, {{ stream: true }})).split('\\n');
+                pending = lines.pop();
+                lines.forEach(takeLine);
+                return pump();
+            }});
+        }}
+        return pump();
+    }}
+
+    function importOuterHtml(outerHtml) {{
+        // Parse each distinct fragment once. Scrubbing back and forth reuses
+        // the cached node via cloneNode instead of another parse.
+        let node = fragmentCache.get(outerHtml);
+        if (node === undefined) {{
+            node = parseSvgFragment(outerHtml);
+            fragmentCache.set(outerHtml, node);
+        }}
+        return node ? node.cloneNode(true) : null;
+    }}
+
+    function parseSvgFragment(outerHtml) {{
+        // Parse in the context of the live SVG where Range supports it: no
+        // wrapper document, and the nodes already belong to this document.
+        if (svgDoc && typeof document.createRange === 'function') {{
+            try {{
+                const range = document.createRange();
+                range.selectNodeContents(svgDoc);
+                const node = range.createContextualFragment(outerHtml).firstElementChild;
+                if (node && node.namespaceURI === 'http://www.w3.org/2000/svg') return node;
+            }} catch (e) {{
+                // Fall back to DOMParser below.
+            }}
+        }}
+        // Parse fragment by wrapping it in an <svg> root so namespaces work.
+        const wrapper = '<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink">' + outerHtml + '</svg>';
+        const doc = domParser.parseFromString(wrapper, 'image/svg+xml');
+        const replacement = doc.querySelector('parsererror')
+            ? null
+            : doc.documentElement.firstElementChild;
+        return replacement ? document.importNode(replacement, true) : null;
+    }}
+
+    function updateElementCacheForSwap(oldElem, newElem) {{
+        // Patch the id cache for just the swapped subtree instead of rescanning
+        // the whole SVG after every outerHTML replacement.
+        const forget = e => {{
+            if (svgElements[e.id] === e) delete svgElements[e.id];
+        }};
+        if (oldElem.id) forget(oldElem);
+        oldElem.querySelectorAll('[id]').forEach(forget);
+        if (newElem.id) svgElements[newElem.id] = newElem;
+        newElem.querySelectorAll('[id]').forEach(e => {{
+            svgElements[e.id] = e;
+        }});
+    }}
+
+    function replaceWithOuterHtml(existingElem, outerHtml) {{
         try {{
-            const parser = new DOMParser();
-            const wrapper = '<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink">' + outerHtml + '</svg>';
-            const doc = parser.parseFromString(wrapper, 'image/svg+xml');
-            const parserError = doc.querySelector('parsererror');
-            if (parserError) return false;
-            const replacement = doc.documentElement.firstElementChild;
-            if (!replacement) return false;
-            const imported = document.importNode(replacement, true);
+            const imported = importOuterHtml(outerHtml);
+            if (!imported) return false;
             existingElem.replaceWith(imported);
+            updateElementCacheForSwap(existingElem, imported);
             return true;
         }} catch (e) {{
             return false;
@@ -898,16 +1298,117 @@ def generate_delta_html(
         // To support random access and ensure frame 0 correctly reverts changes,
         // we must start from a clean base SVG on every render.
         if (!baseSvgTemplate) return;
+        // The template was cloned after styleSvg ran, so the clone already
+        // carries the sizing attributes, inline styles and class.
         const fresh = baseSvgTemplate.cloneNode(true);
-        container.innerHTML = '';
-        container.appendChild(fresh);
-        svgDoc = fresh;
-
-        styleSvg(svgDoc);
+        mountSvg(fresh);
 
         buildElementCache();
     }}
 
+    function buildRevertPlan(entry) {{
+        // Resolve everything needed to put a frame's changes back to base:
+        // attribute names are decoded and base values read from the immutable
+        // template here, once, so a revert only writes to the live SVG.
+        // Returns null when only a clean remount can revert the frame.
+        if (Object.prototype.hasOwnProperty.call(entry, 'fullSvg')) return null;
+        const plan = [];
+        for (const [elemId, changes] of Object.entries(entry.changes || {{}})) {{
+            const baseElem = baseElementsById[elemId];
+            if (!baseElem) return null;
+
+            if (Object.prototype.hasOwnProperty.call(changes, 'outerHTML')) {{
+                const baseOuter = baseOuterHtmlFor(elemId);
+                if (!baseOuter) return null;
+                plan.push({{ id: elemId, attr: 'outerHTML', ns: null, local: null, value: baseOuter }});
+                continue;
+            }}
+
+            for (const attr of Object.keys(changes)) {{
+                if (attr === 'tailContent') continue;
+                if (attr === 'textContent') {{
+                    plan.push({{ id: elemId, attr, ns: null, local: null, value: baseElem.textContent || '' }});
+                    continue;
+                }}
+                const nsInfo = parseNamespacedAttr(attr);
+                const baseVal = nsInfo
+                    ? baseElem.getAttributeNS(nsInfo.ns, nsInfo.local)
+                    : baseElem.getAttribute(attr);
+                plan.push({{
+                    id: elemId,
+                    attr,
+                    ns: nsInfo ? nsInfo.ns : null,
+                    local: nsInfo ? nsInfo.local : attr,
+                    value: baseVal === undefined ? null : baseVal,
+                }});
+            }}
+        }}
+        return plan;
+    }}
+
+    function revertPlanFor(frameIndex) {{
+        // Built the first time a frame is left, then reused on every later visit.
+        let plan = revertPlans.get(frameIndex);
+        if (plan === undefined) {{
+            plan = buildRevertPlan(deltas[frameIndex] || {{}});
+            revertPlans.set(frameIndex, plan);
+        }}
+        return plan;
+    }}
+
+    function buildApplyPlan(entry) {{
+        // Flatten a frame's nested changes into one list of steps with the
+        // attribute names already decoded, so applying it is a single loop.
+        const plan = [];
+        for (const [elemId, changes] of Object.entries(entry.changes || {{}})) {{
+            for (const [attr, value] of Object.entries(changes)) {{
+                if (attr === 'tailContent') continue;  // non-visual in our SVGs
+                if (attr === 'outerHTML' || attr === 'textContent') {{
+                    plan.push({{ id: elemId, attr, ns: null, local: null, value }});
+                    continue;
+                }}
+                const nsInfo = parseNamespacedAttr(attr);
+                plan.push({{
+                    id: elemId,
+                    attr,
+                    ns: nsInfo ? nsInfo.ns : null,
+                    local: nsInfo ? nsInfo.local : attr,
+                    value,
+                }});
+            }}
+        }}
+        return plan;
+    }}
+
+    function applyPlanFor(frameIndex) {{
+        let plan = applyPlans.get(frameIndex);
+        if (plan === undefined) {{
+            plan = buildApplyPlan(deltas[frameIndex] || {{}});
+            applyPlans.set(frameIndex, plan);
+        }}
+        return plan;
+    }}
+
+    function writeOrSwap(elem, step) {{
+        // Returns false when an outerHTML swap could not be performed.
+        if (step.attr === 'outerHTML') return replaceWithOuterHtml(elem, step.value);
+        writeStep(elem, step);
+        return true;
+    }}
+
+    function writeStep(elem, step) {{
+        // A null value means the attribute is absent in the target state.
+        if (step.attr === 'textContent') {{
+            elem.textContent = step.value;
+        }} else if (step.value === null) {{
+            if (step.ns) elem.removeAttributeNS(step.ns, step.local);
+            else elem.removeAttribute(step.local);
+        }} else {{
+            if (step.ns) elem.setAttributeNS(step.ns, step.local, step.value);
+            else elem.setAttribute(step.local, step.value);
+        }}
+    }}
+
     function revertLastFrameToBase() {{
         if (lastFrameIndex === null) return;
         if (!deltas || lastFrameIndex < 0 || lastFrameIndex >= deltas.length) {{
@@ -915,75 +1416,32 @@ def generate_delta_html(
             return;
         }}
 
-        // If the last frame was rendered by full SVG replacement,
-        // a clean remount is the only safe revert.
-        const lastEntry = deltas[lastFrameIndex] || {{}};
-        if (Object.prototype.hasOwnProperty.call(lastEntry, 'fullSvg')) {{
-            mountFreshBaseSvg();
-            lastFrameIndex = null;
-            return;
-        }}
-
-        const lastDelta = lastEntry;
-        const changesByElem = lastDelta.changes || {{}};
-
-        let needFullReset = false;
-        let didReplaceOuterHtml = false;
-
-        for (const [elemId, changes] of Object.entries(changesByElem)) {{
-            const liveElem = svgElements[elemId];
-            const baseElem = baseElementsById[elemId];
-            if (!liveElem || !baseElem) {{
-                needFullReset = true;
-                break;
-            }}
+        // Frames rendered by full SVG replacement (or touching elements the
+        // base lacks) have no plan; a clean remount is the only safe revert.
+        const plan = revertPlanFor(lastFrameIndex);
+        let needFullReset = plan === null;
 
-            if (Object.prototype.hasOwnProperty.call(changes, 'outerHTML')) {{
-                const baseOuter = baseOuterHtmlById[elemId];
-                if (!baseOuter) {{
+        if (plan) {{
+            for (const step of plan) {{
+                const liveElem = svgElements[step.id];
+                if (!liveElem) {{
                     needFullReset = true;
                     break;
                 }}
-                const ok = replaceWithOuterHtmlForRevert(liveElem, baseOuter);
-                if (!ok) {{
+                if (!writeOrSwap(liveElem, step)) {{
                     needFullReset = true;
                     break;
                 }}
-                didReplaceOuterHtml = true;
-                continue;
-            }}
-
-            for (const attr of Object.keys(changes)) {{
-                if (attr === 'textContent') {{
-                    liveElem.textContent = baseElem.textContent || '';
-                }} else if (attr === 'tailContent') {{
-                    // skip
-                }} else {{
-                    const nsInfo = parseNamespacedAttrForRevert(attr);
-                    const baseVal = nsInfo
-                        ? baseElem.getAttributeNS(nsInfo.ns, nsInfo.local)
-                        : baseElem.getAttribute(attr);
-
-                    if (baseVal === null || baseVal === undefined) {{
-                        if (nsInfo) liveElem.removeAttributeNS(nsInfo.ns, nsInfo.local);
-                        else liveElem.removeAttribute(attr);
-                    }} else {{
-                        if (nsInfo) liveElem.setAttributeNS(nsInfo.ns, nsInfo.local, baseVal);
-                        else liveElem.setAttribute(attr, baseVal);
-                    }}
-                }}
             }}
         }}
 
         if (needFullReset) {{
             mountFreshBaseSvg();
-        }} else if (didReplaceOuterHtml) {{
-            buildElementCache();
         }}
 
         lastFrameIndex = null;
     }}
-    
+
     function applyDelta(frameIndex) {{
         if (!deltas || frameIndex < 0 || frameIndex >= deltas.length) return;
         
@@ -993,16 +1451,13 @@ def generate_delta_html(
         if (Object.prototype.hasOwnProperty.call(delta, 'fullSvg')) {{
             try {{
                 const svgText = delta.fullSvg;
-                const parser = new DOMParser();
-                const doc = parser.parseFromString(svgText, 'image/svg+xml');
+                const doc = domParser.parseFromString(svgText, 'image/svg+xml');
                 const parserError = doc.querySelector('parsererror');
                 if (parserError) throw new Error(parserError.textContent || 'SVG parse error');
                 const svgElement = doc.documentElement;
                 if (!svgElement || svgElement.localName !== 'svg') throw new Error('No SVG element');
                 const importedSvg = document.importNode(svgElement, true);
-                container.innerHTML = '';
-                container.appendChild(importedSvg);
-                svgDoc = importedSvg;
+                mountSvg(importedSvg);
                 styleSvg(svgDoc);
                 buildElementCache();
                 updateValueDisplay(frameIndex);
@@ -1014,131 +1469,82 @@ def generate_delta_html(
             }}
         }}
         
-        let didReplaceOuterHtml = false;
-
-        function parseNamespacedAttr(attr) {{
-            // Supports:
-            // - Clark notation from lxml/ElementTree (namespace + localname)
-            // - Double-brace encoding (JSON-safe alternative)
-            //
-            // NOTE: This string is emitted from a Python f-string; avoid
-            // literal brace characters in this JS source.
-
-            if (!attr || attr.length < 3) return null;
-
-            const LBRACE = 123; // left brace
-            const RBRACE = 125; // right brace
-
-            if (attr.charCodeAt(0) !== LBRACE) return null;
-
-            // Double-brace encoding: starts with '{{'
-            if (attr.length >= 4 && attr.charCodeAt(1) === LBRACE) {{
-                // Find the first occurrence of '}}' after position 2
-                for (let i = 2; i < attr.length - 1; i++) {{
-                    if (attr.charCodeAt(i) === RBRACE && attr.charCodeAt(i + 1) === RBRACE) {{
-                        const ns = attr.slice(2, i);
-                        const local = attr.slice(i + 2);
-                        if (ns && local) return {{ ns, local }};
-                        return null;
-                    }}
-                }}
-                return null;
-            }}
-
-            // Clark notation: starts with '{' and has a single closing '}'
-            const close = attr.indexOf(String.fromCharCode(RBRACE));
-            if (close <= 1) return null;
-            const ns = attr.slice(1, close);
-            const local = attr.slice(close + 1);
-            if (!ns || !local) return null;
-            return {{ ns, local }};
+        // Apply each change
+        for (const step of applyPlanFor(frameIndex)) {{
+            const elem = svgElements[step.id];
+            if (!elem) continue;
+            writeOrSwap(elem, step);
         }}
+    }}
 
-        function replaceWithOuterHtml(existingElem, outerHtml) {{
-            try {{
-                // Parse fragment by wrapping it in an <svg> root so namespaces work.
-                const parser = new DOMParser();
-                const wrapper = '<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink">' + outerHtml + '</svg>';
-                const doc = parser.parseFromString(wrapper, 'image/svg+xml');
-                const parserError = doc.querySelector('parsererror');
-                if (parserError) {{
-                    return;
-                }}
-                const replacement = doc.documentElement.firstElementChild;
-                if (!replacement) return;
-                const imported = document.importNode(replacement, true);
-                existingElem.replaceWith(imported);
-                didReplaceOuterHtml = true;
-            }} catch (e) {{
-            }}
+    function transitionBetweenFrames(prevIndex, nextIndex) {{
+        // Diff-of-diffs: both deltas are relative to the base SVG, so moving
+        // between two frames only touches entries that differ. Text groups
+        // whose outerHTML is identical in both frames are left mounted.
+        // Returns false when the caller must revert to base and apply instead.
+        const prevEntry = deltas[prevIndex];
+        const nextEntry = deltas[nextIndex];
+        if (!prevEntry || !nextEntry) return false;
+        const hasOwn = Object.prototype.hasOwnProperty;
+        if (hasOwn.call(prevEntry, 'fullSvg') || hasOwn.call(nextEntry, 'fullSvg')) return false;
+        const prevChanges = prevEntry.changes || {{}};
+        const nextChanges = nextEntry.changes || {{}};
+        for (const id in prevChanges) {{
+            if (!svgElements[id]) return false;
         }}
+        const prevPlan = revertPlanFor(prevIndex);
+        if (!prevPlan) return false;
 
-        // Apply each change
-        for (const [elemId, changes] of Object.entries(delta.changes)) {{
-            const elem = svgElements[elemId];
-            if (!elem) continue;
-            
-            for (const [attr, value] of Object.entries(changes)) {{
-                if (attr === 'outerHTML') {{
-                    replaceWithOuterHtml(elem, value);
-                }} else if (attr === 'textContent') {{
-                    elem.textContent = value;
-                }} else if (attr === 'tailContent') {{
-                    // Tail text is text after the element (rare in SVG)
-                    // For now, skip this
-                }} else if (value === null) {{
-                    // Handle namespaced attributes for removal
-                    const nsInfo = parseNamespacedAttr(attr);
-                    if (nsInfo) {{
-                        elem.removeAttributeNS(nsInfo.ns, nsInfo.local);
-                    }} else {{
-                        elem.removeAttribute(attr);
-                    }}
-                }} else {{
-                    // Handle namespaced attributes (xlink and similar).
-                    const nsInfo = parseNamespacedAttr(attr);
-                    if (nsInfo) {{
-                        elem.setAttributeNS(nsInfo.ns, nsInfo.local, value);
-                    }} else {{
-                        elem.setAttribute(attr, value);
-                    }}
-                }}
-            }}
+        // A failed swap leaves the SVG between the two frames; remount the
+        // base so the caller applies the next frame from scratch.
+        const abandon = () => {{
+            mountFreshBaseSvg();
+            lastFrameIndex = null;
+            return false;
+        }};
+
+        // Reset what the previous frame changed but the next one does not.
+        for (const step of prevPlan) {{
+            const newAttrs = nextChanges[step.id];
+            if (newAttrs && hasOwn.call(newAttrs, step.attr)) continue;
+            if (!writeOrSwap(svgElements[step.id], step)) return abandon();
         }}
 
-        // If we replaced any subtree, rebuild cache so subsequent deltas can
-        // find newly created nodes by id.
-        if (didReplaceOuterHtml) {{
-            buildElementCache();
+        // Write only values that differ from what the previous frame left behind.
+        for (const step of applyPlanFor(nextIndex)) {{
+            const elem = svgElements[step.id];
+            if (!elem) continue;
+            const oldAttrs = prevChanges[step.id];
+            if (oldAttrs && hasOwn.call(oldAttrs, step.attr) && oldAttrs[step.attr] === step.value) continue;
+            if (!writeOrSwap(elem, step)) return abandon();
         }}
+        return true;
     }}
 
     function renderFrame(frameIndex) {{
         if (!svgDoc || !deltas) return;
         if (!baseSvgTemplate) return;
+        if (frameIndex === lastFrameIndex) return;
 
-        if (!svgElements || Object.keys(svgElements).length === 0) buildElementCache();
-        if (!baseElementsById || Object.keys(baseElementsById).length === 0) buildBaseCache();
+        if (!svgElements || isEmptyCache(svgElements)) buildElementCache();
+        if (!baseElementsById || isEmptyCache(baseElementsById)) buildBaseCache();
 
-        if (lastFrameIndex !== null) {{
+        if (lastFrameIndex === null || !transitionBetweenFrames(lastFrameIndex, frameIndex)) {{
             revertLastFrameToBase();
+            applyDelta(frameIndex);
         }}
-
-        applyDelta(frameIndex);
         lastFrameIndex = frameIndex;
         updateValueDisplay(frameIndex);
     }}
     
     function updateFrame() {{
-        const index = parseInt(slider.value);
-        
-        if (pendingFrame !== null) {{
-            cancelAnimationFrame(pendingFrame);
-        }}
-        
+        // At most one rAF is in flight, and it reads the slider when it fires,
+        // so a burst of input/change/touchmove events costs a single render.
+        // renderFrame skips the frame that is already shown.
+        if (pendingFrame !== null) return;
         pendingFrame = requestAnimationFrame(() => {{
-            renderFrame(index);
             pendingFrame = null;
+            renderFrame(parseInt(slider.value));
         }});
     }}
 }})();
@@ -1153,6 +1559,7 @@ def generate_multi_delta_html(
     unique_id: str,
     wrapper_style: str = "",
     height: str = "auto",
+    base_svg: str | None = None,
 ) -> str:
     """Generate HTML for a multi-variable delta-based interactive graph.
 
@@ -1161,13 +1568,17 @@ def generate_multi_delta_html(
     - variables: [{name, values, min, max, step}, ...]
     - strides: [int, ...]
     - initial_indices: [int, ...]
+
+    When `base_svg` is given, it is embedded in the page and `base_svg_url`
+    is not fetched (see `read_inline_base_svg`).
     """
+    inline_base_svg = _inline_base_svg_block(unique_id, base_svg)
 
     return f"""
 <div class="interactive-graph-wrapper" style="{wrapper_style}">
     <div class="interactive-graph-container" style="display: inline-block; width: 100%;">
         <div class="interactive-graph-display" style="text-align: center;">
-            <div id="svg-container-{unique_id}" class="adaptive-figure" style="width: 100%; display: block;"></div>
+            <div id="svg-container-{unique_id}" class="adaptive-figure" style="width: 100%; display: block;"></div>{inline_base_svg}
         </div>
         <div class="interactive-graph-controls" style="padding: 8px 0; text-align: center;">
             <div id="interactive-controls-{unique_id}" style="max-width: 720px; margin: 0 auto;"></div>
@@ -1244,17 +1655,18 @@ def generate_multi_delta_html(
         return;
     }}
 
+    const greekLatex = {{
+        alpha: '\\\\alpha', beta: '\\\\beta', gamma: '\\\\gamma', delta: '\\\\delta',
+        epsilon: '\\\\epsilon', zeta: '\\\\zeta', eta: '\\\\eta', theta: '\\\\theta',
+        iota: '\\\\iota', kappa: '\\\\kappa', lambda: '\\\\lambda', mu: '\\\\mu',
+        nu: '\\\\nu', xi: '\\\\xi', pi: '\\\\pi', rho: '\\\\rho', sigma: '\\\\sigma',
+        tau: '\\\\tau', upsilon: '\\\\upsilon', phi: '\\\\phi', chi: '\\\\chi',
+        psi: '\\\\psi', omega: '\\\\omega',
+        varphi: '\\\\varphi', vartheta: '\\\\vartheta'
+    }};
+
     function latexForVarName(name) {{
-        const greek = {{
-            alpha: '\\\\alpha', beta: '\\\\beta', gamma: '\\\\gamma', delta: '\\\\delta',
-            epsilon: '\\\\epsilon', zeta: '\\\\zeta', eta: '\\\\eta', theta: '\\\\theta',
-            iota: '\\\\iota', kappa: '\\\\kappa', lambda: '\\\\lambda', mu: '\\\\mu',
-            nu: '\\\\nu', xi: '\\\\xi', pi: '\\\\pi', rho: '\\\\rho', sigma: '\\\\sigma',
-            tau: '\\\\tau', upsilon: '\\\\upsilon', phi: '\\\\phi', chi: '\\\\chi',
-            psi: '\\\\psi', omega: '\\\\omega',
-            varphi: '\\\\varphi', vartheta: '\\\\vartheta'
-        }};
-        if (greek[name]) return greek[name];
+        if (greekLatex[name]) return greekLatex[name];
         return name;
     }}
 
@@ -1263,24 +1675,34 @@ def generate_multi_delta_html(
         return String(v);
     }}
 
+    const katexHtmlCache = new Map();  // LaTeX label -> rendered HTML | null on failure
+
     function setLabelHtml(i, latex, fallbackText) {{
         const el = labels[i];
         if (!el) return;
         if (window.katex) {{
-            try {{
-                el.innerHTML = window.katex.renderToString(latex, {{
-                    throwOnError: false,
-                    displayMode: false,
-                }});
+            // Scrubbing revisits the same few labels; render each one once.
+            let html = katexHtmlCache.get(latex);
+            if (html === undefined) {{
+                try {{
+                    html = window.katex.renderToString(latex, {{
+                        throwOnError: false,
+                        displayMode: false,
+                    }});
+                }} catch (e) {{
+                    html = null;
+                }}
+                katexHtmlCache.set(latex, html);
+            }}
+            if (html !== null) {{
+                el.innerHTML = html;
                 return;
-            }} catch (e) {{
-                // fall through
             }}
         }}
         el.textContent = fallbackText;
     }}
 
-    function parseNamespacedAttr(attr) {{
+    function decodeNamespacedAttr(attr) {{
         // Supports:
         // - Clark notation from lxml/ElementTree (namespace + localname)
         // - Double-brace encoding (JSON-safe alternative)
@@ -1311,19 +1733,110 @@ def generate_multi_delta_html(
         return {{ ns, local }};
     }}
 
+    const namespacedAttrCache = new Map();  // attribute key -> {{ ns, local }} | null
+
+    function parseNamespacedAttr(attr) {{
+        // Only a handful of distinct keys ever occur (essentially xlink:href),
+        // so decode each once and answer repeats with a single lookup.
+        let parsed = namespacedAttrCache.get(attr);
+        if (parsed === undefined) {{
+            parsed = decodeNamespacedAttr(attr);
+            namespacedAttrCache.set(attr, parsed);
+        }}
+        return parsed;
+    }}
+
+    const domParser = new DOMParser();
+    const fragmentCache = new Map();  // outerHTML string -> imported node (never mounted)
+
+    function readDeltas(response) {{
+        // deltas.json holds one frame per line (see save_delta_format), so
+        // frames are decoded while the body is still arriving instead of in
+        // one JSON.parse of the whole array once the download has finished.
+        if (!response.body || typeof response.body.getReader !== 'function' || typeof TextDecoder !== 'function') {{
+            return response.json();
+        }}
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        const frames = [];
+        let pending = '';
+
+        function takeLine(line) {{
+            if (line.charCodeAt(0) === 123) {{  // '{{': one frame, maybe followed by ','
+                frames.push(JSON.parse(line.charCodeAt(line.length - 1) === 44 ? line.slice(0, -1) : line));
+            }} else if (line.length > 1 && line.charCodeAt(0) === 91) {{  // single-line array
+                for (const frame of JSON.parse(line)) frames.push(frame);
+            }}
+            // Otherwise a bare '[' or ']' delimiter line.
+        }}
+
+        function pump() {{
+            return reader.read().then(({{ done, value }}) => {{
+                if (done) {{
+                    takeLine(pending + decoder.decode());
+                    return frames;
+                }}
+                const lines = (pending + decoder.decode(value, {{ stream: true }})).split('\\n');
+                pending = lines.pop();
+                lines.forEach(takeLine);
+                return pump();
+            }});
+        }}
+        return pump();
+    }}
+
+    function importOuterHtml(outerHtml) {{
+        // Parse each distinct fragment once; revisits clone the cached node.
+        let node = fragmentCache.get(outerHtml);
+        if (node === undefined) {{
+            node = parseSvgFragment(outerHtml);
+            fragmentCache.set(outerHtml, node);
+        }}
+        return node ? node.cloneNode(true) : null;
+    }}
+
+    function parseSvgFragment(outerHtml) {{
+        // Parse in the context of the live SVG where Range supports it: no
+        // wrapper document, and the nodes already belong to this document.
+        if (svgDoc && typeof document.createRange === 'function') {{
+            try {{
+                const range = document.createRange();
+                range.selectNodeContents(svgDoc);
+                const node = range.createContextualFragment(outerHtml).firstElementChild;
+                if (node && node.namespaceURI === 'http://www.w3.org/2000/svg') return node;
+            }} catch (e) {{
+                // Fall back to DOMParser below.
+            }}
+        }}
+        // Parse fragment by wrapping it in an <svg> root so namespaces work.
+        const wrapper = '<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink">' + outerHtml + '</svg>';
+        const doc = domParser.parseFromString(wrapper, 'image/svg+xml');
+        const replacement = doc.querySelector('parsererror')
+            ? null
+            : doc.documentElement.firstElementChild;
+        return replacement ? document.importNode(replacement, true) : null;
+    }}
+
+    function updateElementCacheForSwap(oldElem, newElem) {{
+        // Patch the id cache for just the swapped subtree instead of rescanning
+        // the whole SVG after every outerHTML replacement.
+        const forget = e => {{
+            if (svgElements[e.id] === e) delete svgElements[e.id];
+        }};
+        if (oldElem.id) forget(oldElem);
+        oldElem.querySelectorAll('[id]').forEach(forget);
+        if (newElem.id) svgElements[newElem.id] = newElem;
+        newElem.querySelectorAll('[id]').forEach(e => {{
+            svgElements[e.id] = e;
+        }});
+    }}
+
     function replaceWithOuterHtml(existingElem, outerHtml) {{
         try {{
-            const parser = new DOMParser();
-            const wrapper = '<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink">' + outerHtml + '</svg>';
-            const doc = parser.parseFromString(wrapper, 'image/svg+xml');
-            const parserError = doc.querySelector('parsererror');
-            if (parserError) {{
-                return false;
-            }}
-            const replacement = doc.documentElement.firstElementChild;
-            if (!replacement) return false;
-            const imported = document.importNode(replacement, true);
+            const imported = importOuterHtml(outerHtml);
+            if (!imported) return false;
             existingElem.replaceWith(imported);
+            updateElementCacheForSwap(existingElem, imported);
             return true;
         }} catch (e) {{
             return false;
@@ -1333,15 +1846,31 @@ def generate_multi_delta_html(
     let svgDoc = null;
     let deltas = null;
     let meta = null;
-    let svgElements = {{}};
+    let svgElements = Object.create(null);
     let sliders = [];
     let labels = [];
+    let varLatexNames = [];  // LaTeX form of each variable name, resolved once
+    let labelIndices = [];  // value index each label currently shows
     let pendingFrame = null;
 
     // Safari performance: keep one mounted SVG and revert only changed nodes.
     let lastFrameIndex = null;
-    let baseElementsById = {{}};
-    let baseOuterHtmlById = {{}};
+    let baseElementsById = Object.create(null);
+    let baseOuterHtmlById = Object.create(null);
+    const revertPlans = new Map();  // frame index -> resolved revert steps | null
+    const applyPlans = new Map();  // frame index -> flattened apply steps
+
+    function mountSvg(svg) {{
+        // Swap the displayed SVG in one DOM mutation rather than clearing the
+        // container through innerHTML and appending afterwards.
+        if (typeof container.replaceChildren === 'function') {{
+            container.replaceChildren(svg);
+        }} else {{
+            container.innerHTML = '';
+            container.appendChild(svg);
+        }}
+        svgDoc = svg;
+    }}
 
     function styleSvg(svg) {{
         if (!svg) return;
@@ -1369,9 +1898,15 @@ def generate_multi_delta_html(
         svg.classList.add('adaptive-figure');
     }}
 
+    function isEmptyCache(cache) {{
+        // Stops at the first id; Object.keys would copy every id on each render.
+        for (const id in cache) return false;
+        return true;
+    }}
+
     function buildElementCache() {{
         if (!svgDoc) return;
-        svgElements = {{}};
+        svgElements = Object.create(null);
         svgDoc.querySelectorAll('[id]').forEach(elem => {{
             svgElements[elem.id] = elem;
         }});
@@ -1379,16 +1914,27 @@ def generate_multi_delta_html(
 
     function buildBaseCache() {{
         if (!baseSvgTemplate) return;
-        baseElementsById = {{}};
-        baseOuterHtmlById = {{}};
+        baseElementsById = Object.create(null);
+        baseOuterHtmlById = Object.create(null);
+        revertPlans.clear();
         baseSvgTemplate.querySelectorAll('[id]').forEach(elem => {{
             baseElementsById[elem.id] = elem;
+        }});
+    }}
+
+    function baseOuterHtmlFor(elemId) {{
+        // Serialized on first use: only outerHTML reverts (text groups) need
+        // it, and serializing every nested id'd element up front is quadratic.
+        let html = baseOuterHtmlById[elemId];
+        if (html === undefined) {{
             try {{
-                baseOuterHtmlById[elem.id] = elem.outerHTML;
+                html = baseElementsById[elemId].outerHTML || null;
             }} catch (e) {{
-                // ignore
+                html = null;
             }}
-        }});
+            baseOuterHtmlById[elemId] = html;
+        }}
+        return html;
     }}
 
     function mountFreshBaseSvg() {{
@@ -1396,16 +1942,117 @@ def generate_multi_delta_html(
         // SVG on every update ensures frame 0 (and other endpoints) correctly
         // revert all changes.
         if (!baseSvgTemplate) return;
+        // The template was cloned after styleSvg ran, so the clone already
+        // carries the sizing attributes, inline styles and class.
         const fresh = baseSvgTemplate.cloneNode(true);
-        container.innerHTML = '';
-        container.appendChild(fresh);
-        svgDoc = fresh;
-
-        styleSvg(svgDoc);
+        mountSvg(fresh);
 
         buildElementCache();
     }}
 
+    function buildRevertPlan(entry) {{
+        // Resolve everything needed to put a frame's changes back to base:
+        // attribute names are decoded and base values read from the immutable
+        // template here, once, so a revert only writes to the live SVG.
+        // Returns null when only a clean remount can revert the frame.
+        if (Object.prototype.hasOwnProperty.call(entry, 'fullSvg')) return null;
+        const plan = [];
+        for (const [elemId, changes] of Object.entries(entry.changes || {{}})) {{
+            const baseElem = baseElementsById[elemId];
+            if (!baseElem) return null;
+
+            if (Object.prototype.hasOwnProperty.call(changes, 'outerHTML')) {{
+                const baseOuter = baseOuterHtmlFor(elemId);
+                if (!baseOuter) return null;
+                plan.push({{ id: elemId, attr: 'outerHTML', ns: null, local: null, value: baseOuter }});
+                continue;
+            }}
+
+            for (const attr of Object.keys(changes)) {{
+                if (attr === 'tailContent') continue;
+                if (attr === 'textContent') {{
+                    plan.push({{ id: elemId, attr, ns: null, local: null, value: baseElem.textContent || '' }});
+                    continue;
+                }}
+                const nsInfo = parseNamespacedAttr(attr);
+                const baseVal = nsInfo
+                    ? baseElem.getAttributeNS(nsInfo.ns, nsInfo.local)
+                    : baseElem.getAttribute(attr);
+                plan.push({{
+                    id: elemId,
+                    attr,
+                    ns: nsInfo ? nsInfo.ns : null,
+                    local: nsInfo ? nsInfo.local : attr,
+                    value: baseVal === undefined ? null : baseVal,
+                }});
+            }}
+        }}
+        return plan;
+    }}
+
+    function revertPlanFor(frameIndex) {{
+        // Built the first time a frame is left, then reused on every later visit.
+        let plan = revertPlans.get(frameIndex);
+        if (plan === undefined) {{
+            plan = buildRevertPlan(deltas[frameIndex] || {{}});
+            revertPlans.set(frameIndex, plan);
+        }}
+        return plan;
+    }}
+
+    function buildApplyPlan(entry) {{
+        // Flatten a frame's nested changes into one list of steps with the
+        // attribute names already decoded, so applying it is a single loop.
+        const plan = [];
+        for (const [elemId, changes] of Object.entries(entry.changes || {{}})) {{
+            for (const [attr, value] of Object.entries(changes)) {{
+                if (attr === 'tailContent') continue;  // non-visual in our SVGs
+                if (attr === 'outerHTML' || attr === 'textContent') {{
+                    plan.push({{ id: elemId, attr, ns: null, local: null, value }});
+                    continue;
+                }}
+                const nsInfo = parseNamespacedAttr(attr);
+                plan.push({{
+                    id: elemId,
+                    attr,
+                    ns: nsInfo ? nsInfo.ns : null,
+                    local: nsInfo ? nsInfo.local : attr,
+                    value,
+                }});
+            }}
+        }}
+        return plan;
+    }}
+
+    function applyPlanFor(frameIndex) {{
+        let plan = applyPlans.get(frameIndex);
+        if (plan === undefined) {{
+            plan = buildApplyPlan(deltas[frameIndex] || {{}});
+            applyPlans.set(frameIndex, plan);
+        }}
+        return plan;
+    }}
+
+    function writeOrSwap(elem, step) {{
+        // Returns false when an outerHTML swap could not be performed.
+        if (step.attr === 'outerHTML') return replaceWithOuterHtml(elem, step.value);
+        writeStep(elem, step);
+        return true;
+    }}
+
+    function writeStep(elem, step) {{
+        // A null value means the attribute is absent in the target state.
+        if (step.attr === 'textContent') {{
+            elem.textContent = step.value;
+        }} else if (step.value === null) {{
+            if (step.ns) elem.removeAttributeNS(step.ns, step.local);
+            else elem.removeAttribute(step.local);
+        }} else {{
+            if (step.ns) elem.setAttributeNS(step.ns, step.local, step.value);
+            else elem.setAttribute(step.local, step.value);
+        }}
+    }}
+
     function revertLastFrameToBase() {{
         if (lastFrameIndex === null) return;
         if (!deltas || lastFrameIndex < 0 || lastFrameIndex >= deltas.length) {{
@@ -1413,70 +2060,27 @@ def generate_multi_delta_html(
             return;
         }}
 
-        // If the last frame was rendered by full SVG replacement,
-        // a clean remount is the only safe revert.
-        const lastEntry = deltas[lastFrameIndex] || {{}};
-        if (Object.prototype.hasOwnProperty.call(lastEntry, 'fullSvg')) {{
-            mountFreshBaseSvg();
-            lastFrameIndex = null;
-            return;
-        }}
-
-        const lastDelta = lastEntry;
-        const changesByElem = lastDelta.changes || {{}};
-
-        let needFullReset = false;
-        let didReplaceOuterHtml = false;
-
-        for (const [elemId, changes] of Object.entries(changesByElem)) {{
-            const liveElem = svgElements[elemId];
-            const baseElem = baseElementsById[elemId];
-            if (!liveElem || !baseElem) {{
-                needFullReset = true;
-                break;
-            }}
+        // Frames rendered by full SVG replacement (or touching elements the
+        // base lacks) have no plan; a clean remount is the only safe revert.
+        const plan = revertPlanFor(lastFrameIndex);
+        let needFullReset = plan === null;
 
-            if (Object.prototype.hasOwnProperty.call(changes, 'outerHTML')) {{
-                const baseOuter = baseOuterHtmlById[elemId];
-                if (!baseOuter) {{
+        if (plan) {{
+            for (const step of plan) {{
+                const liveElem = svgElements[step.id];
+                if (!liveElem) {{
                     needFullReset = true;
                     break;
                 }}
-                const ok = replaceWithOuterHtml(liveElem, baseOuter);
-                if (!ok) {{
+                if (!writeOrSwap(liveElem, step)) {{
                     needFullReset = true;
                     break;
                 }}
-                didReplaceOuterHtml = true;
-                continue;
-            }}
-
-            for (const attr of Object.keys(changes)) {{
-                if (attr === 'textContent') {{
-                    liveElem.textContent = baseElem.textContent || '';
-                }} else if (attr === 'tailContent') {{
-                    // skip
-                }} else {{
-                    const nsInfo = parseNamespacedAttr(attr);
-                    const baseVal = nsInfo
-                        ? baseElem.getAttributeNS(nsInfo.ns, nsInfo.local)
-                        : baseElem.getAttribute(attr);
-
-                    if (baseVal === null || baseVal === undefined) {{
-                        if (nsInfo) liveElem.removeAttributeNS(nsInfo.ns, nsInfo.local);
-                        else liveElem.removeAttribute(attr);
-                    }} else {{
-                        if (nsInfo) liveElem.setAttributeNS(nsInfo.ns, nsInfo.local, baseVal);
-                        else liveElem.setAttribute(attr, baseVal);
-                    }}
-                }}
             }}
         }}
 
         if (needFullReset) {{
             mountFreshBaseSvg();
-        }} else if (didReplaceOuterHtml) {{
-            buildElementCache();
         }}
 
         lastFrameIndex = null;
@@ -1490,16 +2094,13 @@ def generate_multi_delta_html(
         if (Object.prototype.hasOwnProperty.call(delta, 'fullSvg')) {{
             try {{
                 const svgText = delta.fullSvg;
-                const parser = new DOMParser();
-                const doc = parser.parseFromString(svgText, 'image/svg+xml');
+                const doc = domParser.parseFromString(svgText, 'image/svg+xml');
                 const parserError = doc.querySelector('parsererror');
                 if (parserError) throw new Error(parserError.textContent || 'SVG parse error');
                 const svgElement = doc.documentElement;
                 if (!svgElement || svgElement.localName !== 'svg') throw new Error('No SVG element');
                 const importedSvg = document.importNode(svgElement, true);
-                container.innerHTML = '';
-                container.appendChild(importedSvg);
-                svgDoc = importedSvg;
+                mountSvg(importedSvg);
                 styleSvg(svgDoc);
                 buildElementCache();
                 return;
@@ -1509,31 +2110,55 @@ def generate_multi_delta_html(
             }}
         }}
 
-        let didReplaceOuterHtml = false;
-
-        for (const [elemId, changes] of Object.entries(delta.changes || {{}})) {{
-            const elem = svgElements[elemId];
+        for (const step of applyPlanFor(frameIndex)) {{
+            const elem = svgElements[step.id];
             if (!elem) continue;
-            for (const [attr, value] of Object.entries(changes)) {{
-                if (attr === 'outerHTML') {{
-                    didReplaceOuterHtml = replaceWithOuterHtml(elem, value) || didReplaceOuterHtml;
-                }} else if (attr === 'textContent') {{
-                    elem.textContent = value;
-                }} else if (attr === 'tailContent') {{
-                    // skip
-                }} else if (value === null) {{
-                    const nsInfo = parseNamespacedAttr(attr);
-                    if (nsInfo) elem.removeAttributeNS(nsInfo.ns, nsInfo.local);
-                    else elem.removeAttribute(attr);
-                }} else {{
-                    const nsInfo = parseNamespacedAttr(attr);
-                    if (nsInfo) elem.setAttributeNS(nsInfo.ns, nsInfo.local, value);
-                    else elem.setAttribute(attr, value);
-                }}
-            }}
+            writeOrSwap(elem, step);
+        }}
+    }}
+
+    function transitionBetweenFrames(prevIndex, nextIndex) {{
+        // Diff-of-diffs: both deltas are relative to the base SVG, so moving
+        // between two frames only touches entries that differ. Text groups
+        // whose outerHTML is identical in both frames are left mounted.
+        // Returns false when the caller must revert to base and apply instead.
+        const prevEntry = deltas[prevIndex];
+        const nextEntry = deltas[nextIndex];
+        if (!prevEntry || !nextEntry) return false;
+        const hasOwn = Object.prototype.hasOwnProperty;
+        if (hasOwn.call(prevEntry, 'fullSvg') || hasOwn.call(nextEntry, 'fullSvg')) return false;
+        const prevChanges = prevEntry.changes || {{}};
+        const nextChanges = nextEntry.changes || {{}};
+        for (const id in prevChanges) {{
+            if (!svgElements[id]) return false;
+        }}
+        const prevPlan = revertPlanFor(prevIndex);
+        if (!prevPlan) return false;
+
+        // A failed swap leaves the SVG between the two frames; remount the
+        // base so the caller applies the next frame from scratch.
+        const abandon = () => {{
+            mountFreshBaseSvg();
+            lastFrameIndex = null;
+            return false;
+        }};
+
+        // Reset what the previous frame changed but the next one does not.
+        for (const step of prevPlan) {{
+            const newAttrs = nextChanges[step.id];
+            if (newAttrs && hasOwn.call(newAttrs, step.attr)) continue;
+            if (!writeOrSwap(svgElements[step.id], step)) return abandon();
         }}
 
-        if (didReplaceOuterHtml) buildElementCache();
+        // Write only values that differ from what the previous frame left behind.
+        for (const step of applyPlanFor(nextIndex)) {{
+            const elem = svgElements[step.id];
+            if (!elem) continue;
+            const oldAttrs = prevChanges[step.id];
+            if (oldAttrs && hasOwn.call(oldAttrs, step.attr) && oldAttrs[step.attr] === step.value) continue;
+            if (!writeOrSwap(elem, step)) return abandon();
+        }}
+        return true;
     }}
 
     function computeFrameIndex(indices) {{
@@ -1550,44 +2175,47 @@ def generate_multi_delta_html(
 
     function updateValueDisplay(indices) {{
         for (let i = 0; i < meta.variables.length; i++) {{
+            // Only the labels of sliders that moved are rewritten.
+            if (labelIndices[i] === indices[i]) continue;
+            labelIndices[i] = indices[i];
             const name = meta.variables[i].name;
             const v = meta.variables[i].values[indices[i]];
             const vStr = formatValue(v);
             const text = name + ' = ' + vStr;
-            const latex = latexForVarName(name) + ' = ' + vStr;
+            const latex = varLatexNames[i] + ' = ' + vStr;
             setLabelHtml(i, latex, text);
         }}
     }}
 
     function updateFrame() {{
-        const indices = currentIndices();
-        const frameIndex = computeFrameIndex(indices);
-
-        // Update labels immediately (cheap)
-        updateValueDisplay(indices);
-
-        // Throttle expensive DOM work for Safari/slow browsers
-        if (pendingFrame !== null) {{
-            cancelAnimationFrame(pendingFrame);
-        }}
+        // At most one rAF is in flight, and it reads the sliders when it fires,
+        // so a burst of input/change/touchmove events costs a single render.
+        if (pendingFrame !== null) return;
         pendingFrame = requestAnimationFrame(() => {{
-            if (!svgElements || Object.keys(svgElements).length === 0) buildElementCache();
-            if (!baseElementsById || Object.keys(baseElementsById).length === 0) buildBaseCache();
+            pendingFrame = null;
+            const indices = currentIndices();
+            const frameIndex = computeFrameIndex(indices);
+            // Drag and touchmove bursts often land back on the frame already shown.
+            if (frameIndex === lastFrameIndex) return;
+            updateValueDisplay(indices);
 
-            if (lastFrameIndex !== null) {{
+            if (!svgElements || isEmptyCache(svgElements)) buildElementCache();
+            if (!baseElementsById || isEmptyCache(baseElementsById)) buildBaseCache();
+
+            if (lastFrameIndex === null || !transitionBetweenFrames(lastFrameIndex, frameIndex)) {{
                 revertLastFrameToBase();
+                applyDelta(frameIndex);
             }}
-
-            applyDelta(frameIndex);
             lastFrameIndex = frameIndex;
-            pendingFrame = null;
         }});
     }}
 
     function buildControls() {{
-        controlsRoot.innerHTML = '';
         sliders = [];
         labels = [];
+        labelIndices = [];
+        // Rows are assembled off-document and swapped in with one mutation.
+        const rows = document.createDocumentFragment();
 
         for (let i = 0; i < meta.variables.length; i++) {{
             const v = meta.variables[i];
@@ -1630,45 +2258,59 @@ def generate_multi_delta_html(
 
             row.appendChild(labelSpan);
             row.appendChild(sliderWrap);
-            controlsRoot.appendChild(row);
+            rows.appendChild(row);
             sliders.push(input);
             labels.push(labelSpan);
         }}
+
+        if (typeof controlsRoot.replaceChildren === 'function') {{
+            controlsRoot.replaceChildren(rows);
+        }} else {{
+            controlsRoot.innerHTML = '';
+            controlsRoot.appendChild(rows);
+        }}
     }}
 
-    Promise.all([
-        fetch(baseSvgUrl).then(r => {{
+    // A small base SVG is embedded in the page instead of fetched. It is
+    // parsed as soon as it is available, while the JSON files still load.
+    const inlineBaseSvg = document.getElementById('base-svg-' + uniqueId);
+    const baseSvgPromise = (
+        inlineBaseSvg ? Promise.resolve(inlineBaseSvg.textContent) : fetch(baseSvgUrl).then(r => {{
             if (!r.ok) throw new Error('Failed to load base SVG: ' + r.status);
             return r.text();
-        }}),
-        fetch(deltasJsonUrl).then(r => {{
-            if (!r.ok) throw new Error('Failed to load deltas JSON: ' + r.status);
-            return r.json();
-        }}),
-        fetch(metaJsonUrl).then(r => {{
-            if (!r.ok) throw new Error('Failed to load meta JSON: ' + r.status);
-            return r.json();
-        }}),
-    ]).then(([svgText, deltasData, metaData]) => {{
+        }})
+    ).then(svgText => {{
         // Remove XML declaration, DOCTYPE, and metadata with undeclared namespaces
-        svgText = svgText.replace(/<\\?xml[^?]*\\?>/g, '');
-        svgText = svgText.replace(/<!DOCTYPE[^>]*>/g, '');
-        svgText = svgText.replace(/<metadata>[\\s\\S]*?<\\/metadata>/g, '');
+        // in one pass; metadata must go before parsing, since its prefixes
+        // would make the XML parse fail.
+        svgText = svgText.replace(
+            /<\\?xml[^?]*\\?>|<!DOCTYPE[^>]*>|<metadata>[\\s\\S]*?<\\/metadata>/g, ''
+        );
 
-        const parser = new DOMParser();
-        const doc = parser.parseFromString(svgText, 'image/svg+xml');
+        const doc = domParser.parseFromString(svgText, 'image/svg+xml');
         const parserError = doc.querySelector('parsererror');
         if (parserError) throw new Error('Failed to parse base.svg as SVG XML');
         const svgElement = doc.documentElement;
         if (!svgElement || svgElement.localName !== 'svg') throw new Error('No SVG element found');
 
-        const importedSvg = document.importNode(svgElement, true);
-        container.innerHTML = '';
-        container.appendChild(importedSvg);
+        return document.importNode(svgElement, true);
+    }});
 
-        svgDoc = importedSvg;
+    Promise.all([
+        baseSvgPromise,
+        fetch(deltasJsonUrl).then(r => {{
+            if (!r.ok) throw new Error('Failed to load deltas JSON: ' + r.status);
+            return readDeltas(r);
+        }}),
+        fetch(metaJsonUrl).then(r => {{
+            if (!r.ok) throw new Error('Failed to load meta JSON: ' + r.status);
+            return r.json();
+        }}),
+    ]).then(([importedSvg, deltasData, metaData]) => {{
+        mountSvg(importedSvg);
         deltas = deltasData;
         meta = metaData;
+        varLatexNames = meta.variables.map(v => latexForVarName(v.name));
 
         styleSvg(svgDoc);
 
@@ -0,0 +1,66 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+from munchboka_edutools.directives import signchart2
+from munchboka_edutools.directives.signchart2 import plot
+
+
+def test_signchart2_restyling_reuses_analysis():
+    signchart2._ANALYSIS_CACHE.clear()
+
+    fig1, ax = plot("x**2 - 4", fontsize=24)
+    labels = [t.get_text() for t in ax.get_xticklabels()]
+    assert len(signchart2._ANALYSIS_CACHE) == 1
+
+    fig2, ax = plot("x**2 - 4", fontsize=16, color=False, include_factors=False)
+    restyled = [t.get_text() for t in ax.get_xticklabels()]
+
+    assert fig2 is fig1
+    assert fig2.axes == [ax]
+    assert len(signchart2._ANALYSIS_CACHE) == 1
+    assert restyled == labels == ["$-2$", "$2$"]
+
+
+def test_signchart2_reuses_shared_figure():
+    fig1, ax1 = plot("x - 1")
+    n_texts = len(ax1.texts)
+    fig2, ax2 = plot("x - 1")
+
+    assert fig2 is fig1
+    assert fig2.axes == [ax2]
+    assert len(ax2.texts) == n_texts
+
+
+def test_signchart2_repeated_chart_gets_distinct_ids(tmp_path):
+    import re
+
+    from sphinx.application import Sphinx
+
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "conf.py").write_text(
+        "extensions = ['munchboka_edutools']\nhtml_theme = 'basic'\n", encoding="utf8"
+    )
+    chart = ".. signchart-2::\n\n   function: x**2 - 4\n\n"
+    (src / "index.rst").write_text("Charts\n======\n\n" + chart * 2, encoding="utf8")
+
+    def build_ids():
+        app = Sphinx(
+            srcdir=str(src),
+            confdir=str(src),
+            outdir=str(tmp_path / "build"),
+            doctreedir=str(tmp_path / "doctree"),
+            buildername="html",
+            warningiserror=False,
+            freshenv=True,
+        )
+        app.build()
+        html = (tmp_path / "build" / "index.html").read_text(encoding="utf8")
+        return [re.findall(r'\bid="(sgc2_[^"]+)"', svg) for svg in html.split("<svg")[1:]]
+
+    first, second = build_ids()
+    assert first and second
+    assert not set(first) & set(second)
+    # Ids are reproducible across rebuilds.
+    assert build_ids() == [first, second]
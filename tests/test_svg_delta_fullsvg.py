@@ -123,6 +123,12 @@ def test_prepare_svg_for_deltas_does_not_collide_with_existing_ids() -> None:
     assert 'id="mb_auto_path_0"' in prepared
 
 
+def test_prepare_svg_for_deltas_skips_reserialization_when_all_ids_present() -> None:
+    svg = _wrap_svg('<g id="axes_1"><path id="path_0" d="M 0 0 L 1 1" /></g>')
+    # The self-closing tag spacing would be normalized by an lxml round-trip.
+    assert _prepare_svg_for_deltas(svg) == svg
+
+
 def test_compute_svg_deltas_falls_back_on_legend_frame_geometry_blowup() -> None:
     base = _wrap_svg(
         '<g id="axes_1"></g>'
@@ -144,3 +150,77 @@ def test_compute_svg_deltas_falls_back_on_legend_frame_geometry_blowup() -> None
 
     assert len(deltas) == 2
     assert "fullSvg" in deltas[1]
+
+
+def test_compute_svg_deltas_parallel_matches_sequential(monkeypatch) -> None:
+    from munchboka_edutools.directives import svg_delta
+
+    frames = [
+        _wrap_svg(
+            '<g id="axes_1"><g id="line2d_1">'
+            f'<path id="path_1" d="M 0 0 L {i} 1"/><path d="M {i} 0 L 1 1"/>'
+            "</g></g>"
+        )
+        for i in range(4)
+    ]
+
+    expected = compute_svg_deltas(frames)
+
+    monkeypatch.setattr(svg_delta, "_PARALLEL_MIN_FRAMES", 2)
+    monkeypatch.setattr(svg_delta.os, "cpu_count", lambda: 2)
+    assert compute_svg_deltas(frames) == expected
+
+
+def test_save_delta_format_writes_deltas_as_json_array(tmp_path) -> None:
+    import json
+
+    from munchboka_edutools.directives.svg_delta import save_delta_format
+
+    deltas = [
+        {"frame": 0, "changes": {}},
+        {"frame": 1, "changes": {"path_1": {"d": "M 0 0", "fill": None}}},
+        {"frame": 2, "fullSvg": "<svg>−</svg>"},
+    ]
+    save_delta_format("<svg/>", iter(deltas), str(tmp_path))
+
+    assert json.loads((tmp_path / "deltas.json").read_text(encoding="utf-8")) == deltas
+    meta = json.loads((tmp_path / "metadata.json").read_text(encoding="utf-8"))
+    assert meta["frame_count"] == 3
+
+
+def test_save_delta_format_writes_gzip_sidecars(tmp_path) -> None:
+    import gzip
+
+    from munchboka_edutools.directives.svg_delta import save_delta_format
+
+    save_delta_format("<svg/>", [{"frame": 0, "changes": {}}], str(tmp_path))
+
+    for name in ("base.svg", "deltas.json"):
+        plain = (tmp_path / name).read_bytes()
+        assert gzip.decompress((tmp_path / (name + ".gz")).read_bytes()) == plain
+
+
+def test_compute_svg_deltas_repeats_delta_for_identical_frames() -> None:
+    frames = [
+        _wrap_svg(f'<g id="axes_1"><g id="line2d_1"><path id="path_1" d="M 0 0 L {i} 1"/></g></g>')
+        for i in (0, 1, 0, 1)
+    ]
+
+    _base, deltas = compute_svg_deltas(frames)
+
+    assert [d["frame"] for d in deltas] == [0, 1, 2, 3]
+    assert deltas[2] == {"frame": 2, "changes": {}}
+    assert deltas[1]["changes"] == {"path_1": {"d": "M 0 0 L 1 1"}}
+    assert deltas[3] == {**deltas[1], "frame": 3}
+
+
+def test_generate_delta_html_embeds_small_base_svg() -> None:
+    from munchboka_edutools.directives.svg_delta import generate_delta_html
+
+    base = _wrap_svg('<g id="text_1"><!-- 0 --><text>0</text></g>')
+    html = generate_delta_html("base.svg", "deltas.json", "abc", "a", [0.0, 1.0], base_svg=base)
+    assert f'<script type="image/svg+xml" id="base-svg-abc">{base}</script>' in html
+
+    unsafe = _wrap_svg("<script>x()</script>")
+    html = generate_delta_html("base.svg", "deltas.json", "abc", "a", [0.0, 1.0], base_svg=unsafe)
+    assert 'type="image/svg+xml"' not in html